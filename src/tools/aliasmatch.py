@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+基于 Aho–Corasick 自动机的别名查找与替换。
+
+`PUAtoalias.txt` 中的别名多为“在字框”“斜玉”这样的多字名称。正常情况下它们
+在拆分表里以 `{在字框}` 的形式出现；当别名直接嵌在没有花括号的文本中时，
+逐个子串去查表的代价是 O(n * 最长别名长度)。自动机只需对文本扫描一遍。
+
+匹配规则为“最左最长、互不重叠”：从左到右，每个位置取以该位置开头的最长别名，
+替换后从别名之后继续；没有别名开头的字符原样保留。
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+
+class AliasMatcher:
+    """由“别名 -> 替换文本”构建一次，之后可反复用于查找和替换。"""
+
+    def __init__(self, mapping: Dict[str, str]) -> None:
+        self.mapping = mapping
+        # 节点 0 为根；goto[i] 为字符转移，fail[i] 为失配链接
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # 以该节点结尾的别名长度（0 表示不是别名结尾）
+        self._length: List[int] = [0]
+        # 沿失配链接能到达的最近一个别名结尾节点（0 表示没有）
+        self._output: List[int] = [0]
+
+        for alias in mapping:
+            if alias:
+                self._insert(alias)
+        self._link()
+
+    def _insert(self, alias: str) -> None:
+        node = 0
+        for ch in alias:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._length.append(0)
+                self._output.append(0)
+            node = nxt
+        self._length[node] = len(alias)
+
+    def _link(self) -> None:
+        queue: Deque[int] = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                fc = self._fail[child] = self._goto[f].get(ch, 0)
+                self._output[child] = fc if self._length[fc] else self._output[fc]
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """返回 [(起点, 终点, 别名)]，按最左最长、互不重叠选取。"""
+        # 先记录每个起点上能匹配到的最长别名，再从左到右贪心选取
+        longest: Dict[int, int] = {}
+        goto, fail, length, output = self._goto, self._fail, self._length, self._output
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if length[node] else output[node]
+            while hit:
+                start = i + 1 - length[hit]
+                if length[hit] > longest.get(start, 0):
+                    longest[start] = length[hit]
+                hit = output[hit]
+
+        matches: List[Tuple[int, int, str]] = []
+        i = 0
+        n = len(text)
+        while i < n:
+            size = longest.get(i)
+            if size:
+                matches.append((i, i + size, text[i : i + size]))
+                i += size
+            else:
+                i += 1
+        return matches
+
+    def replace(self, text: str) -> str:
+        """把文本中的别名替换为对应的映射结果。"""
+        matches = self.find(text)
+        if not matches:
+            return text
+        parts: List[str] = []
+        pos = 0
+        for start, end, alias in matches:
+            parts.append(text[pos:start])
+            parts.append(self.mapping[alias])
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+解析器与生成步骤的基准测试，在仓库自带的数据上运行，并与保存的基线比较。
+
+每一项先载入数据（不计时），再重复运行若干次，计时期间关闭垃圾回收；
+报告中位数与 p95 耗时，另用 tracemalloc 单独跑一次，记下 Python 分配的内存峰值。
+
+部分项目附带对照实现（逐字扫描的旧切分、逐 token 的旧转换、chaifen 的 JSON 解析等），
+先核对两者结果一致，再报告“加速”＝对照中位数 / 本项中位数。名字带 `:real`、`:hao`
+的项目分别在 ll_div.real.txt、hao_div.txt 上运行，不带的在 ll_div.txt 上运行。
+
+  python src/tools/bench.py                 # 运行全部项目，与基线比较
+  python src/tools/bench.py --save          # 运行并把结果存为新的基线
+  python src/tools/bench.py -k tokenize     # 只运行名字中含 tokenize 的项目
+  python src/tools/bench.py --sizes         # 另列出 chaifen 三种格式的体积与 node 解析耗时
+
+基线随仓库存放在 `benchmarks/baseline.json`，其中记有测得基线的机器，本机不同时会提示，
+耗时仅供参考；可用 --baseline 指定别的文件。中位数比基线慢超过 --tolerance（默认 25%）
+且多出 1 ms 以上，或内存峰值比基线高出 --mem-tolerance（默认 10%）以上时，
+逐项报告并以退出码 1 结束。
+
+用法：
+  python src/tools/bench.py [-k 关键字] [--repeat 7] [--save] [--baseline 文件]
+                            [--tolerance 0.25] [--mem-tolerance 0.10] [--sizes]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import gzip
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import chaifen
+import generate_zigen
+import generate_zigen_hao
+from chaifenbin import decode_chaifen_bin, encode_chaifen_bin
+from divparse import BRACED_RE, load_div, parse_div, parse_zigen_sequence, tokenize_div_rhs
+from evaluate import iter_code_table
+from root_convert import build_pua_to_alias, build_translate_table, convert_div_rhs, map_one_token, read_lines
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.normpath(os.path.join(THIS_DIR, "..", ".."))
+PUBLIC_DIR = os.path.join(REPO_ROOT, "src", "public")
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+LIULI = os.path.join(PUBLIC_DIR, "liuli")
+LL_DIV = os.path.join(LIULI, "ll_div.txt")
+LL_DIV_REAL = os.path.join(LIULI, "ll_div.real.txt")
+LL_FULLCODE = os.path.join(LIULI, "ll_fullcode.txt")
+PUA = os.path.join(LIULI, "PUAtoalias.txt")
+HAO_DIV = os.path.join(PUBLIC_DIR, "hao", "hao_div.txt")
+# 项目名后缀 -> 构形串取自的拆分表
+DIV_FILES = {"": LL_DIV, ":real": LL_DIV_REAL, ":hao": HAO_DIV}
+
+# 耗时差在这个值以内不算回归，避免很快的项目被计时抖动误判
+MIN_SLOWDOWN = 0.001
+
+
+class Prepared(NamedTuple):
+    fn: Callable[[], object]  # 要计时的函数
+    items: int  # 处理的条目数
+    # 对照实现，结果须与 fn 相同
+    reference: Optional[Callable[[], object]] = None
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Callable[[], Prepared]  # 载入数据，不计时
+
+
+class Result(NamedTuple):
+    name: str
+    items: int
+    median: float
+    p95: float
+    peak_kb: float
+    reference: Optional[float] = None  # 对照实现的中位数
+
+
+def div_rhs(path: str) -> List[str]:
+    """每行制表符后的构形串；hao_div.txt 取方括号内的第一个字段。"""
+    rhs: List[str] = []
+    for line in read_lines(path):
+        line = line.strip()
+        if "\t" not in line:
+            continue
+        right = line.split("\t", 1)[1]
+        if right.startswith("["):
+            right = right[1:].split(",", 1)[0]
+        rhs.append(right)
+    return rhs
+
+
+def quiet(fn: Callable[[], object]) -> Callable[[], object]:
+    """生成脚本会打印调试信息，计时时丢掉。"""
+    def run() -> object:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return run
+
+
+# ---- 对照实现 ----
+
+def parse_zigen_sequence_loop(sequence: str) -> List[str]:
+    """原 generate_zigen.py 中逐字扫描的实现。"""
+    components: List[str] = []
+    i = 0
+    n = len(sequence)
+    while i < n:
+        if sequence[i] == "{":
+            j = i + 1
+            while j < n and sequence[j] != "}":
+                j += 1
+            if j < n:
+                components.append(sequence[i + 1 : j])
+                i = j + 1
+            else:
+                components.append(sequence[i])
+                i += 1
+        else:
+            components.append(sequence[i])
+            i += 1
+    return components
+
+
+def tokenize_div_rhs_split(rhs: str) -> List[Tuple[str, bool]]:
+    """用 BRACED_RE.split 切分后再构造元组；比 divparse 中的逐字扫描慢，所以没有采用。"""
+    if "{" not in rhs:
+        return [(ch, False) for ch in rhs]
+    parts = BRACED_RE.split(rhs)
+    tokens: List[Tuple[str, bool]] = []
+    for i in range(0, len(parts) - 1, 2):
+        tokens += [(ch, False) for ch in parts[i]]
+        tokens.append((parts[i + 1], True))
+    tokens += [(ch, False) for ch in parts[-1]]
+    return tokens
+
+
+# ---- 各项目 ----
+
+def _parse_zigen_sequence(path: str) -> Callable[[], Prepared]:
+    def setup() -> Prepared:
+        rhs = div_rhs(path)
+        return Prepared(lambda: [parse_zigen_sequence(s) for s in rhs], len(rhs),
+                        lambda: [parse_zigen_sequence_loop(s) for s in rhs])
+    return setup
+
+
+def _tokenize(path: str) -> Callable[[], Prepared]:
+    def setup() -> Prepared:
+        rhs = div_rhs(path)
+        return Prepared(lambda: [tokenize_div_rhs(s) for s in rhs], len(rhs),
+                        lambda: [tokenize_div_rhs_split(s) for s in rhs])
+    return setup
+
+
+def _convert_div(path: str) -> Callable[[], Prepared]:
+    def setup() -> Prepared:
+        rhs = div_rhs(path)
+        pua_to_alias = build_pua_to_alias(read_lines(PUA))
+        table = build_translate_table(pua_to_alias)
+
+        def by_token(s: str) -> str:
+            # 旧做法：逐 token 查表
+            return "".join(map_one_token(t, braced, pua_to_alias) for t, braced in tokenize_div_rhs(s))
+
+        return Prepared(lambda: [convert_div_rhs(s, pua_to_alias, table) for s in rhs], len(rhs),
+                        lambda: [by_token(s) for s in rhs])
+    return setup
+
+
+def _parse_div() -> Prepared:
+    return Prepared(lambda: parse_div(LL_DIV), len(read_lines(LL_DIV)))
+
+
+def _pua() -> Prepared:
+    lines = read_lines(PUA)
+    return Prepared(lambda: build_pua_to_alias(lines), len(lines))
+
+
+def _extract_components() -> Prepared:
+    lines = [line.strip() for line in read_lines(HAO_DIV)]
+    return Prepared(lambda: [generate_zigen_hao.extract_components(line) for line in lines], len(lines))
+
+
+def _read_hao_div() -> Prepared:
+    return Prepared(quiet(lambda: generate_zigen_hao.read_hao_div(HAO_DIV)), len(read_lines(HAO_DIV)))
+
+
+def _code_table() -> Prepared:
+    return Prepared(lambda: list(iter_code_table(LL_FULLCODE)), len(read_lines(LL_FULLCODE)))
+
+
+def _read_ll_div() -> Prepared:
+    freq = generate_zigen.read_char_frequency(LL_FULLCODE)
+    # read_ll_div 经 load_div 取缓存的解析结果，这里只计统计与取例字
+    entries = load_div(LL_DIV_REAL)
+    return Prepared(quiet(lambda: generate_zigen.read_ll_div(LL_DIV_REAL, freq)), len(entries))
+
+
+def _chaifen_records() -> Prepared:
+    return Prepared(quiet(lambda: chaifen.build_chaifen_records(LIULI)), len(read_lines(LL_DIV_REAL)))
+
+
+def chaifen_blobs() -> Tuple[List[Dict[str, str]], Dict[str, bytes]]:
+    """与 chaifen.py 写出的三种文件内容相同，只在内存中生成。"""
+    records = quiet(lambda: chaifen.build_chaifen_records(LIULI))()
+    return records, {
+        "chaifen.json": json.dumps(records, ensure_ascii=False, indent=4).encode("utf-8"),
+        "chaifen.min.json": json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+        "chaifen.bin": encode_chaifen_bin(records),
+    }
+
+
+def _json_dump(indent: Optional[int]) -> Callable[[], Prepared]:
+    def setup() -> Prepared:
+        records = quiet(lambda: chaifen.build_chaifen_records(LIULI))()
+        separators = None if indent else (",", ":")
+        return Prepared(lambda: json.dumps(records, ensure_ascii=False, indent=indent, separators=separators),
+                        len(records))
+    return setup
+
+
+def _decode_chaifen_bin() -> Prepared:
+    records, blobs = chaifen_blobs()
+    data, text = blobs["chaifen.bin"], blobs["chaifen.min.json"]
+    # 对照为解析同样内容的 chaifen.min.json
+    return Prepared(lambda: decode_chaifen_bin(data), len(records), lambda: json.loads(text))
+
+
+CASES: List[Case] = [
+    *(Case(f"tokenize_div_rhs{suffix}", _tokenize(path)) for suffix, path in DIV_FILES.items()),
+    *(Case(f"parse_zigen_sequence{suffix}", _parse_zigen_sequence(path)) for suffix, path in DIV_FILES.items()),
+    *(Case(f"convert_div_rhs{suffix}", _convert_div(path)) for suffix, path in DIV_FILES.items()),
+    Case("parse_div", _parse_div),
+    Case("build_pua_to_alias", _pua),
+    Case("extract_components", _extract_components),
+    Case("read_hao_div", _read_hao_div),
+    Case("iter_code_table", _code_table),
+    Case("read_ll_div", _read_ll_div),
+    Case("build_chaifen_records", _chaifen_records),
+    Case("json_dump_indent", _json_dump(4)),
+    Case("json_dump_min", _json_dump(None)),
+    Case("decode_chaifen_bin", _decode_chaifen_bin),
+]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩法的分位数。"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 1))
+    return ordered[int(rank) - 1]
+
+
+def time_repeat(fn: Callable[[], object], repeat: int) -> List[float]:
+    times: List[float] = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return times
+
+
+def run_case(case: Case, repeat: int) -> Result:
+    fn, items, reference = case.setup()
+    out = fn()  # 预热
+    reference_median: Optional[float] = None
+    if reference is not None:
+        if reference() != out:
+            raise AssertionError(f"{case.name}: 与对照实现的结果不一致")
+        reference_median = statistics.median(time_repeat(reference, repeat))
+    del out
+    times = time_repeat(fn, repeat)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return Result(case.name, items, statistics.median(times), percentile(times, 0.95), peak / 1024,
+                  reference_median)
+
+
+NODE_PARSE_JSON = """
+const fs = require('fs')
+const text = fs.readFileSync(process.argv[1], 'utf8')
+const t = performance.now()
+JSON.parse(text)
+console.log((performance.now() - t).toFixed(1))
+"""
+
+# 与 decode_chaifen_bin 相同：每列一次 TextDecoder 解码，再按长度表切片
+NODE_PARSE_BIN = """
+const fs = require('fs')
+const b = fs.readFileSync(process.argv[1])
+const t = performance.now()
+const view = new DataView(b.buffer, b.byteOffset, b.length)
+const bytes = new Uint8Array(b.buffer, b.byteOffset, b.length)
+const count = view.getUint32(4, true)
+const decoder = new TextDecoder()
+const columns = []
+let pos = 8
+for (let c = 0; c < 3; c++) {
+    const size = view.getUint32(pos, true)
+    pos += 4
+    const lengths = bytes.subarray(pos, pos + count)
+    pos += count
+    const text = decoder.decode(bytes.subarray(pos, pos + size))
+    pos += size
+    const values = new Array(count)
+    let offset = 0
+    for (let i = 0; i < count; i++) {
+        values[i] = text.slice(offset, offset + lengths[i])
+        offset += lengths[i]
+    }
+    columns.push(values)
+}
+const result = new Array(count)
+for (let i = 0; i < count; i++)
+    result[i] = { name: columns[0][i], comp: columns[1][i], key: columns[2][i] }
+console.log((performance.now() - t).toFixed(1))
+"""
+
+
+def node_parse_ms(path: str) -> str:
+    node = shutil.which("node")
+    if not node:
+        return "-"
+    script = NODE_PARSE_BIN if path.endswith(".bin") else NODE_PARSE_JSON
+    out = subprocess.run([node, "-e", script, path], capture_output=True, text=True)
+    return out.stdout.strip() or "-"
+
+
+def chaifen_sizes() -> List[str]:
+    """chaifen 三种格式的体积、gzip 后体积（GitHub Pages 传输时会压缩）与 node 中的解析耗时。"""
+    records, blobs = chaifen_blobs()
+    base = len(blobs["chaifen.json"])
+    lines = [f"chaifen（liuli）{len(records)} 条记录"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, data in blobs.items():
+            path = os.path.join(tmp, name)
+            with open(path, "wb") as f:
+                f.write(data)
+            lines.append(f"  {name:<18} {len(data) / 1024:9.0f} KiB ({len(data) / base:6.1%})  "
+                         f"gzip {len(gzip.compress(data)) / 1024:7.0f} KiB  node {node_parse_ms(path):>7} ms")
+    return lines
+
+
+def machine() -> Dict[str, str]:
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+
+
+def load_baseline(path: str) -> Optional[Dict[str, object]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, results: List[Result]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = {"machine": machine(), "results": {r.name: r._asdict() for r in results}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def compare(
+    result: Result, base: Optional[Dict[str, float]], tolerance: float, mem_tolerance: float
+) -> Tuple[str, List[str]]:
+    """返回 (与基线相比的说明, 回归描述)。"""
+    if base is None:
+        return "无基线", []
+    ratio = result.median / base["median"] if base["median"] else 1.0
+    problems: List[str] = []
+    if ratio > 1 + tolerance and result.median - base["median"] > MIN_SLOWDOWN:
+        problems.append(f"{result.name}: 中位数 {base['median'] * 1000:.1f} -> {result.median * 1000:.1f} ms"
+                        f"（{ratio - 1:+.0%}）")
+    if base["peak_kb"] and result.peak_kb > base["peak_kb"] * (1 + mem_tolerance):
+        problems.append(f"{result.name}: 内存峰值 {base['peak_kb']:.0f} -> {result.peak_kb:.0f} KiB")
+    return f"{ratio - 1:+.0%}", problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="解析器与生成步骤的基准测试")
+    parser.add_argument("-k", dest="keyword", help="只运行名字中含该关键字的项目")
+    parser.add_argument("--repeat", type=int, default=7, help="每项计时的次数")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线文件")
+    parser.add_argument("--save", action="store_true", help="把本次结果存为基线")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的耗时增幅")
+    parser.add_argument("--mem-tolerance", type=float, default=0.10, help="允许的内存峰值增幅")
+    parser.add_argument("--sizes", action="store_true", help="另列出 chaifen 三种格式的体积与 node 解析耗时")
+    args = parser.parse_args(argv)
+
+    cases = [c for c in CASES if not args.keyword or args.keyword in c.name]
+    if not cases:
+        parser.error(f"没有名字中含 {args.keyword!r} 的项目")
+    baseline = None if args.save else load_baseline(args.baseline)
+    if baseline is not None and baseline.get("machine") != machine():
+        print(f"注意：基线记录于 {baseline.get('machine')}，与本机不同，耗时仅供参考", file=sys.stderr)
+    base_results: Dict[str, Dict[str, float]] = baseline["results"] if baseline else {}  # type: ignore[assignment]
+
+    results: List[Result] = []
+    regressions: List[str] = []
+    print(f"{'项目':<26} {'条目':>8} {'中位数':>10} {'p95':>10} {'内存峰值':>12} {'加速':>6}  基线")
+    for case in cases:
+        r = run_case(case, args.repeat)
+        results.append(r)
+        note, problems = compare(r, base_results.get(r.name), args.tolerance, args.mem_tolerance)
+        regressions += problems
+        speedup = f"{r.reference / r.median:5.1f}x" if r.reference is not None and r.median else "     -"
+        print(f"{r.name:<26} {r.items:>8} {r.median * 1000:>8.1f}ms {r.p95 * 1000:>8.1f}ms "
+              f"{r.peak_kb:>9.0f}KiB {speedup}  {note}{'  <- 回归' if problems else ''}", flush=True)
+    if args.sizes:
+        print("\n".join(chaifen_sizes()))
+
+    if args.save:
+        if args.keyword and os.path.exists(args.baseline):
+            # 只跑了部分项目时，保留基线中其余项目
+            old = load_baseline(args.baseline) or {}
+            kept = old.get("results", {})
+            kept.update({r.name: r._asdict() for r in results})  # type: ignore[union-attr]
+            results = [Result(**v) for v in kept.values()]  # type: ignore[union-attr]
+        save_baseline(args.baseline, results)
+        print(f"基线已写入 {args.baseline}")
+        return 0
+    if regressions:
+        print("性能回归：", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+各方案网站数据的增量构建入口，取代逐个手动运行 root_convert.py、
+generate_zigen.py、generate_zigen_guibing.py、chaifen.py 的做法。
+
+依赖关系（以 liuli 为例，带 * 的为可选步骤）：
+  PUAtoalias.txt + ll_div.txt        -> ll_div.real.txt  *convert_div
+  PUAtoalias.txt + ll_map.txt        -> ll_map.real.txt  *convert_map
+  ll_div.real.txt + ll_fullcode.txt  -> chaifen.json
+  ll_map.real.txt + ll_div.real.txt + ll_fullcode.txt -> zigen1.json、zigen.json
+  ll_fullcode.txt                    -> jianma.txt、jianma.json
+  ll_div.real.txt + ll_fullcode.txt + data/{pinyin,bihua,sijiao}.json -> search.json  *search_index
+  ll_map.real.txt + ll_div.real.txt 推出的全码与 ll_fullcode.txt 核对（只报告）
+
+每个步骤记录其输入与输出文件的内容哈希（sha256），只有当输入内容变化、
+或输出缺失/被改动时才重新执行。上游步骤重新生成但内容不变时，下游不会被触发。
+哈希记录保存在仓库根目录的 `.build-cache/<方案>.json`。
+
+可选步骤默认不运行，要用 --with 指明。ll_div.real.txt、ll_map.real.txt 是随仓库发布的表，
+默认当作输入，不由 ll_div.txt、ll_map.txt 重新生成：两者已有出入（ll_div.txt 缺少约 4300 个
+扩展区的字，部分字的转换结果也不同），重新生成会改变网站数据。search.json 是为搜索页准备的
+合并索引，搜索组件尚未改用，所以也不默认生成，需要时加 --with search_index。
+
+ll_div.real.txt 等登记在步骤的 keep_rows 中：重新生成后行数比原来少时，
+恢复原文件并报错，以免源文件缺行时悄悄丢掉网站数据里的字。确实要删字时加 --allow-shrink。
+
+各方案的步骤登记在 SCHEMES 中，方案之间没有共用的输入输出，构建多个方案时
+放进进程池同时进行（`--jobs`，默认取方案数与 CPU 数中较小者），总用时约等于
+最慢的一个方案。各方案的输出先收在各自进程里，完成后整段打印，不会相互穿插。
+
+用法：
+  python src/tools/build.py              # 构建全部方案
+  python src/tools/build.py liuli ll     # 只构建指定方案
+  python src/tools/build.py --force      # 忽略哈希记录，全部重新生成
+  python src/tools/build.py --jobs 1     # 逐个方案依次构建
+  python src/tools/build.py --list       # 列出各方案的步骤及其输入输出
+  python src/tools/build.py ll --with convert_div --with convert_map  # 同时运行可选步骤
+  python src/tools/build.py --allow-shrink  # 允许 keep_rows 中的输出行数减少
+  python src/tools/build.py --profile --force  # 记录各步骤用时、内存等，见 profiling.py
+
+--profile 时每个方案的报告写到 `.build-cache/profile/<方案>.json`；跳过的步骤只记名字，
+要得到完整的数据需同时加 --force。
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import chaifen
+import fullcode
+import generate_zigen_guibing
+import generate_zigen_hao
+import jianma
+import profiling
+import root_convert
+import search_index
+
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.normpath(os.path.join(THIS_DIR, "..", ".."))
+PUBLIC_DIR = os.path.join(REPO_ROOT, "src", "public")
+CACHE_DIR = os.path.join(REPO_ROOT, ".build-cache")
+PROFILE_DIR = os.path.join(CACHE_DIR, "profile")
+
+
+class SchemeResult(NamedTuple):
+    scheme: str
+    executed: List[str]
+    log: str
+    seconds: float
+    error: Optional[str]  # 失败时为异常的 traceback
+
+
+class Stage(NamedTuple):
+    """一个构建步骤：输入、输出均为相对方案目录的文件名。"""
+
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    run: Callable[[str], None]
+    # 重新生成后行数不得减少的输出
+    keep_rows: Tuple[str, ...] = ()
+    # 可选步骤只在用 --with 指明时运行，其输出视为已有的输入
+    optional: bool = False
+
+
+class ShrinkError(RuntimeError):
+    """keep_rows 中的输出重新生成后行数减少。"""
+
+
+def liuli_stages() -> List[Stage]:
+    return [
+        Stage("convert_div", ("PUAtoalias.txt", "ll_div.txt"), ("ll_div.real.txt",),
+              root_convert.convert_div_file, keep_rows=("ll_div.real.txt",), optional=True),
+        Stage("convert_map", ("PUAtoalias.txt", "ll_map.txt"), ("ll_map.real.txt",),
+              root_convert.convert_map_file, optional=True),
+        Stage("chaifen", ("ll_div.real.txt", "ll_fullcode.txt"),
+              ("chaifen.json",), chaifen.generate_chaifen_json),
+        # 两份字根表共用同一份字根倒排表，一步生成
+        Stage("zigen", ("ll_map.real.txt", "ll_div.real.txt", "ll_fullcode.txt"),
+              ("zigen1.json", "zigen.json"), generate_zigen_guibing.build_zigen_all),
+        Stage("jianma", ("ll_fullcode.txt",), ("jianma.txt", "jianma.json"), jianma.build_jianma),
+        Stage("search_index",
+              ("ll_div.real.txt", "ll_fullcode.txt",
+               "../data/pinyin.json", "../data/bihua.json", "../data/sijiao.json"),
+              ("search.json",), search_index.build_search_index, optional=True),
+        # 只核对 ll_fullcode.txt 与推出的全码是否一致，不产生输出
+        Stage("fullcode_check", ("ll_map.real.txt", "ll_div.real.txt", "ll_fullcode.txt"),
+              (), fullcode.check_fullcode),
+    ]
+
+
+def hao_stages(output_name: str) -> List[Stage]:
+    return [
+        Stage("zigen", ("hao_map.txt", "hao_div.txt"), (output_name,),
+              lambda d: generate_zigen_hao.build_zigen(d, output_name)),
+    ]
+
+
+SCHEMES: Dict[str, Callable[[], List[Stage]]] = {
+    "liuli": liuli_stages,
+    "ll": liuli_stages,
+    "hao": lambda: hao_stages("zigen-xi.json"),
+    "sy": lambda: hao_stages("zigen.json"),
+}
+
+
+def file_hash(path: str) -> Optional[str]:
+    """返回文件内容的 sha256；文件不存在时返回 None。"""
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def order_stages(stages: List[Stage]) -> List[Stage]:
+    """按输入输出关系拓扑排序，保证上游步骤先于下游执行。"""
+    producer = {out: s.name for s in stages for out in s.outputs}
+    by_name = {s.name: s for s in stages}
+    ordered: List[Stage] = []
+    state: Dict[str, int] = {}  # 1 = 访问中, 2 = 已完成
+
+    def visit(stage: Stage) -> None:
+        mark = state.get(stage.name)
+        if mark == 2:
+            return
+        if mark == 1:
+            raise ValueError(f"构建步骤存在循环依赖：{stage.name}")
+        state[stage.name] = 1
+        for inp in stage.inputs:
+            if inp in producer:
+                visit(by_name[producer[inp]])
+        state[stage.name] = 2
+        ordered.append(stage)
+
+    for s in stages:
+        visit(s)
+    return ordered
+
+
+def load_cache(scheme: str) -> Dict[str, Dict[str, Optional[str]]]:
+    path = os.path.join(CACHE_DIR, f"{scheme}.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(scheme: str, cache: Dict[str, Dict[str, Optional[str]]]) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(os.path.join(CACHE_DIR, f"{scheme}.json"), "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def active_stages(scheme: str, extra: Sequence[str] = ()) -> List[Stage]:
+    """按执行顺序列出要运行的步骤：全部非可选步骤，加上 extra 中指明的可选步骤。"""
+    return [s for s in order_stages(SCHEMES[scheme]()) if not s.optional or s.name in extra]
+
+
+def run_keeping_rows(stage: Stage, scheme_dir: str, allow_shrink: bool = False) -> None:
+    """执行步骤；keep_rows 中的输出行数比执行前少时恢复原文件并抛出 ShrinkError。
+    原文件先逐块复制到临时文件留底，行数也是逐块数的，不整个读入内存。"""
+    with contextlib.ExitStack() as stack:
+        previous: Dict[str, Tuple[int, str]] = {}
+        if not allow_shrink:
+            for name in stage.keep_rows:
+                path = os.path.join(scheme_dir, name)
+                if os.path.exists(path):
+                    backup = stack.enter_context(tempfile.TemporaryDirectory(dir=scheme_dir))
+                    shutil.copyfile(path, os.path.join(backup, name))
+                    previous[name] = (profiling.count_lines(path), os.path.join(backup, name))
+        stage.run(scheme_dir)
+        for name, (rows, backup) in previous.items():
+            path = os.path.join(scheme_dir, name)
+            now = profiling.count_lines(path) if os.path.exists(path) else 0
+            if now < rows:
+                os.replace(backup, path)
+                raise ShrinkError(f"{name} 重新生成后由 {rows} 行减少到 {now} 行，已恢复原文件；"
+                                  f"请检查 {', '.join(stage.inputs)}，确需删减时加 --allow-shrink")
+
+
+def build_scheme(
+    scheme: str,
+    force: bool = False,
+    profiler: Optional[profiling.Profiler] = None,
+    checks: bool = True,
+    allow_shrink: bool = False,
+    extra: Sequence[str] = (),
+) -> List[str]:
+    """增量构建一个方案，返回实际执行的步骤名。给出 profiler 时记录各步骤的统计；
+    checks 为 False 时跳过没有输出、只做检查的步骤；allow_shrink 时不检查 keep_rows；
+    extra 为要一并运行的可选步骤。"""
+    scheme_dir = os.path.join(PUBLIC_DIR, scheme)
+    cache = {} if force else load_cache(scheme)
+    hashes: Dict[str, Optional[str]] = {}
+
+    def digest(name: str) -> Optional[str]:
+        if name not in hashes:
+            hashes[name] = file_hash(os.path.join(scheme_dir, name))
+        return hashes[name]
+
+    executed: List[str] = []
+    for stage in active_stages(scheme, extra):
+        if not checks and not stage.outputs:
+            continue
+        current = {name: digest(name) for name in stage.inputs}
+        missing = [name for name in stage.inputs if current[name] is None]
+        if missing:
+            raise FileNotFoundError(f"{scheme}/{stage.name} 缺少输入：{', '.join(missing)}")
+        current.update({name: digest(name) for name in stage.outputs})
+
+        if cache.get(stage.name) == current:
+            print(f"[{scheme}] {stage.name}: 未变化，跳过")
+            if profiler is not None:
+                profiler.skip(stage.name)
+            continue
+
+        print(f"[{scheme}] {stage.name}: 重新生成 {', '.join(stage.outputs)}")
+        if profiler is None:
+            run_keeping_rows(stage, scheme_dir, allow_shrink)
+        else:
+            with profiler.stage(stage.name, scheme_dir, stage.inputs, stage.outputs):
+                run_keeping_rows(stage, scheme_dir, allow_shrink)
+        executed.append(stage.name)
+        for name in stage.outputs:
+            hashes.pop(name, None)
+            current[name] = digest(name)
+        cache[stage.name] = current
+        # 每步完成即落盘，中途失败时已完成的步骤不必重跑
+        save_cache(scheme, cache)
+
+    return executed
+
+
+def _build_scheme_task(
+    scheme: str, force: bool, profile: bool = False, allow_shrink: bool = False, extra: Sequence[str] = ()
+) -> SchemeResult:
+    """在工作进程中构建一个方案，收集其输出；异常转成文本带回主进程。"""
+    start = time.perf_counter()
+    buf = io.StringIO()
+    executed: List[str] = []
+    error: Optional[str] = None
+    profiler = profiling.Profiler(scheme) if profile else None
+    with contextlib.redirect_stdout(buf):
+        try:
+            executed = build_scheme(scheme, force, profiler, allow_shrink=allow_shrink, extra=extra)
+        except Exception:
+            error = traceback.format_exc()
+        if profiler is not None:
+            path = os.path.join(PROFILE_DIR, f"{scheme}.json")
+            profiler.write(path)
+            print("\n".join(profiler.summary()))
+            print(f"[{scheme}] 统计已写入 {os.path.relpath(path, REPO_ROOT)}")
+    return SchemeResult(scheme, executed, buf.getvalue(), time.perf_counter() - start, error)
+
+
+def build_all(
+    schemes: Sequence[str],
+    force: bool = False,
+    jobs: int = 1,
+    profile: bool = False,
+    allow_shrink: bool = False,
+    extra: Sequence[str] = (),
+) -> List[SchemeResult]:
+    """构建多个方案，jobs > 1 时各方案在进程池中同时构建；按完成先后打印并返回结果。"""
+    results: List[SchemeResult] = []
+
+    def report(result: SchemeResult) -> None:
+        sys.stdout.write(result.log)
+        status = "失败" if result.error else f"执行 {len(result.executed)} 步"
+        print(f"[{result.scheme}] {status}，用时 {result.seconds:.1f} s", flush=True)
+        if result.error:
+            sys.stderr.write(result.error)
+        results.append(result)
+
+    if jobs <= 1 or len(schemes) <= 1:
+        for scheme in schemes:
+            report(_build_scheme_task(scheme, force, profile, allow_shrink, extra))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(schemes))) as pool:
+            futures = [
+                pool.submit(_build_scheme_task, scheme, force, profile, allow_shrink, extra) for scheme in schemes
+            ]
+            for future in as_completed(futures):
+                report(future.result())
+    return results
+
+
+def describe_schemes(schemes: Sequence[str]) -> str:
+    lines: List[str] = []
+    for scheme in schemes:
+        lines.append(f"{scheme}（{os.path.relpath(os.path.join(PUBLIC_DIR, scheme), REPO_ROOT)}）")
+        for stage in order_stages(SCHEMES[scheme]()):
+            outputs = ", ".join(stage.outputs) or "（只检查）"
+            note = f"（可选，--with {stage.name}）" if stage.optional else ""
+            lines.append(f"  {stage.name}: {', '.join(stage.inputs)} -> {outputs}{note}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="增量构建各方案的网站数据")
+    parser.add_argument("schemes", nargs="*", metavar="scheme",
+                        help=f"要构建的方案，默认全部：{', '.join(SCHEMES)}")
+    parser.add_argument("--force", action="store_true", help="忽略哈希记录，全部重新生成")
+    parser.add_argument("--jobs", "-j", type=int, default=0,
+                        help="同时构建的方案数，默认取方案数与 CPU 数中较小者")
+    parser.add_argument("--list", action="store_true", help="列出各方案的步骤及其输入输出，不构建")
+    parser.add_argument("--profile", action="store_true",
+                        help="记录各步骤的用时、吞吐、内存与输出大小，写到 .build-cache/profile/")
+    parser.add_argument("--allow-shrink", action="store_true",
+                        help="允许 ll_div.real.txt 等输出重新生成后行数减少")
+    parser.add_argument("--with", dest="extra", action="append", default=[], metavar="步骤",
+                        help="同时运行该可选步骤，可重复使用；--list 中标有“可选”的步骤")
+    args = parser.parse_args(argv)
+    unknown = [s for s in args.schemes if s not in SCHEMES]
+    if unknown:
+        parser.error(f"未知方案：{', '.join(unknown)}")
+
+    schemes = args.schemes or list(SCHEMES)
+    optional = {stage.name for scheme in schemes for stage in SCHEMES[scheme]() if stage.optional}
+    bad = [name for name in args.extra if name not in optional]
+    if bad:
+        parser.error(f"不是可选步骤：{', '.join(bad)}；可选步骤：{', '.join(sorted(optional)) or '无'}")
+    if args.list:
+        print(describe_schemes(schemes))
+        return 0
+    jobs = args.jobs or min(len(schemes), os.cpu_count() or 1)
+    start = time.perf_counter()
+    results = build_all(schemes, force=args.force, jobs=jobs, profile=args.profile,
+                        allow_shrink=args.allow_shrink, extra=args.extra)
+    failed = [r.scheme for r in results if r.error]
+    print(f"共 {len(schemes)} 个方案，用时 {time.perf_counter() - start:.1f} s"
+          + (f"，失败：{', '.join(failed)}" if failed else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成 chaifen.json 文件
+通过 ll_div.real.txt 和 ll_fullcode.txt 来生成 chaifen.json
+
+指定 `--compact` 时，另写两份内容相同、体积更小的文件：
+- chaifen.min.json：去掉缩进与空白的 JSON
+- chaifen.bin：按列存放的二进制格式，见 chaifenbin.py
+网页组件目前只读取 chaifen.json，所以构建时不生成这两份；体积与解析耗时的对比见
+`python src/tools/bench.py --sizes`。
+
+指定 `--shards N` 时，另按编码排序，以编码前 N 码分片写入 chaifen-shards/ 目录，
+并写出清单 manifest.json，网页输入时只需下载已输入前缀对应的分片：
+  {"prefixLength": N, "count": 总条数,
+   "shards": {"前缀": {"file": "文件名", "count": 条数}, ...}}
+
+指定 `--sorted` 时，另写 chaifen.sorted.json：记录已按编码排好序，并附带编码前缀
+（1 至 `--index-depth` 码，默认 2）到记录区间 [起, 止) 的索引，读取方不必再排序，
+不超过索引码长的前缀直接查表即可（输入法组件目前仍读取 chaifen.json，载入时排序）：
+  {"prefixLength": 2, "index": {"a": [0, 3040], "ab": [0, 120], ...}, "records": [...]}
+
+用法：
+  python src/tools/chaifen.py [方案目录] [--compact] [--shards N] [--sorted [--index-depth D]]
+  方案目录默认为 `src/public/liuli`
+"""
+
+import argparse
+import json
+import os
+
+from chaifenbin import encode_chaifen_bin
+from divparse import load_div
+from profiling import phase
+
+DEFAULT_SCHEME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'liuli')
+
+def load_ll_div_data(file_path):
+    """加载 ll_div.real.txt 数据"""
+    data = {}
+    # 与字根表生成共用同一份解析结果
+    for entry in load_div(file_path):
+        if entry.rhs is not None:
+            data[entry.char] = entry.rhs
+    return data
+
+def load_code_table_data(file_path):
+    """加载 ll_fullcode.txt 数据"""
+    data = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and '\t' in line:
+                parts = line.split('\t')
+                if len(parts) >= 2:
+                    char, key = parts[0], parts[1]
+                    data[char] = key
+    return data
+
+def build_chaifen_records(scheme_dir=DEFAULT_SCHEME_DIR):
+    """合并拆分与编码，返回按字符排序的 [{name, comp, key}]"""
+    # 文件路径
+    ll_div_file = os.path.join(scheme_dir, 'll_div.real.txt')
+    code_table_file = os.path.join(scheme_dir, 'll_fullcode.txt')
+    
+    print(f"正在加载 {ll_div_file}...")
+    with phase('tokenize'):
+        ll_div_data = load_ll_div_data(ll_div_file)
+    print(f"加载了 {len(ll_div_data)} 个汉字的部件数据")
+    
+    print(f"正在加载 {code_table_file}...")
+    with phase('load'):
+        code_table_data = load_code_table_data(code_table_file)
+    print(f"加载了 {len(code_table_data)} 个汉字的键码数据")
+    
+    # 合并数据
+    result = []
+    processed_chars = set()
+    
+    # 遍历 ll_div.real.txt 中的字符
+    with phase('map'):
+        for char, comp in ll_div_data.items():
+            if char in code_table_data and char not in processed_chars:
+                key = code_table_data[char]
+                result.append({
+                    "name": char,
+                    "comp": comp,
+                    "key": key
+                })
+                processed_chars.add(char)
+        
+        # 按字符排序（可选）
+        result.sort(key=lambda x: x['name'])
+    
+    print(f"生成了 {len(result)} 个字符的数据")
+    return result
+
+def sort_by_key(records):
+    """按编码排序，与输入法组件中的 sortFunc 一致（稳定排序，同码保持原顺序）"""
+    return sorted(records, key=lambda x: x['key'])
+
+def shard_file_name(prefix):
+    """分片文件名：编码里的标点（如 / ;）转成 _十六进制，避免成为路径的一部分"""
+    return ''.join(c if c.isalnum() else f'_{ord(c):02x}' for c in prefix) + '.json'
+
+def build_prefix_index(sorted_records, depth):
+    """对已按编码排序的记录，求每个 1..depth 码前缀对应的区间 [起, 止)"""
+    index = {}
+    for i, item in enumerate(sorted_records):
+        key = item['key']
+        for n in range(1, min(depth, len(key)) + 1):
+            span = index.get(key[:n])
+            if span is None:
+                index[key[:n]] = [i, i + 1]
+            else:
+                # 排序后同一前缀的记录相邻，只需延长区间终点
+                span[1] = i + 1
+    return index
+
+def write_sorted_chaifen(records, output_file, depth=2):
+    """写出按编码排序并带前缀索引的 chaifen.sorted.json"""
+    sorted_records = sort_by_key(records)
+    data = {
+        'prefixLength': depth,
+        'index': build_prefix_index(sorted_records, depth),
+        'records': sorted_records,
+    }
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+    return data
+
+def write_chaifen_shards(records, out_dir, prefix_length=1):
+    """按编码前 prefix_length 码分片写出，返回清单"""
+    os.makedirs(out_dir, exist_ok=True)
+    # 清掉上次生成、这次可能已不存在的分片
+    for name in os.listdir(out_dir):
+        if name.endswith('.json'):
+            os.remove(os.path.join(out_dir, name))
+    
+    shards = {}
+    for item in sort_by_key(records):
+        shards.setdefault(item['key'][:prefix_length], []).append(item)
+    
+    manifest = {'prefixLength': prefix_length, 'count': len(records), 'shards': {}}
+    for prefix, items in shards.items():
+        file_name = shard_file_name(prefix)
+        with open(os.path.join(out_dir, file_name), 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False, separators=(',', ':'))
+        manifest['shards'][prefix] = {'file': file_name, 'count': len(items)}
+    
+    with open(os.path.join(out_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+def generate_chaifen_json(scheme_dir=DEFAULT_SCHEME_DIR, shard_prefix=0, index_depth=0, compact=False):
+    """生成 chaifen.json；compact 时另写紧凑版本 chaifen.min.json、chaifen.bin；
+    shard_prefix > 0 时另写按编码前缀分片的 chaifen-shards/；
+    index_depth > 0 时另写按编码排序、带前缀索引的 chaifen.sorted.json"""
+    result = build_chaifen_records(scheme_dir)
+    output_file = os.path.join(scheme_dir, 'chaifen.json')
+    
+    # 写入 JSON 文件
+    with phase('serialize'):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=4)
+        print(f"已生成 {output_file}")
+    
+    if compact:
+        with phase('serialize'):
+            min_file = os.path.join(scheme_dir, 'chaifen.min.json')
+            with open(min_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, separators=(',', ':'))
+            print(f"已生成 {min_file}")
+            
+            bin_file = os.path.join(scheme_dir, 'chaifen.bin')
+            with open(bin_file, 'wb') as f:
+                f.write(encode_chaifen_bin(result))
+            print(f"已生成 {bin_file}")
+    
+    if shard_prefix > 0:
+        shard_dir = os.path.join(scheme_dir, 'chaifen-shards')
+        manifest = write_chaifen_shards(result, shard_dir, shard_prefix)
+        print(f"已生成 {shard_dir}，共 {len(manifest['shards'])} 个分片")
+    
+    if index_depth > 0:
+        sorted_file = os.path.join(scheme_dir, 'chaifen.sorted.json')
+        data = write_sorted_chaifen(result, sorted_file, index_depth)
+        print(f"已生成 {sorted_file}，索引 {len(data['index'])} 个前缀")
+    
+    return len(result)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='生成 chaifen.json')
+    parser.add_argument('scheme_dir', nargs='?', default=DEFAULT_SCHEME_DIR, help='方案目录')
+    parser.add_argument('--compact', action='store_true',
+                        help='另写 chaifen.min.json 与 chaifen.bin')
+    parser.add_argument('--shards', type=int, default=0, metavar='N',
+                        help='按编码前 N 码分片输出到 chaifen-shards/（默认不分片）')
+    parser.add_argument('--sorted', action='store_true',
+                        help='另写按编码排序、带前缀索引的 chaifen.sorted.json')
+    parser.add_argument('--index-depth', type=int, default=2, metavar='D',
+                        help='前缀索引覆盖的最大码长（默认 2）')
+    args = parser.parse_args()
+    try:
+        index_depth = args.index_depth if args.sorted else 0
+        count = generate_chaifen_json(args.scheme_dir, args.shards, index_depth, args.compact)
+        print(f"成功生成 chaifen.json，包含 {count} 个字符")
+    except Exception as e:
+        print(f"生成失败: {e}")
+        import traceback
+        traceback.print_exc()
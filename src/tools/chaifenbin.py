@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+chaifen 数据的紧凑二进制格式（chaifen.bin），按列存放 name / comp / key。
+
+布局（整数均为小端）：
+  4 字节   魔数 b"CFB1"
+  u32      记录数 N
+  依次三列（name、comp、key），每列：
+    u32      字符串表的字节数 B
+    N 字节   每条记录该列的长度（UTF-16 码元数，与 JS 字符串的 length 一致），
+             超过 255 的字段无法存放，写入时报错并指出是哪个字
+    B 字节   该列所有字符串按顺序直接拼接后的 UTF-8
+
+读取时每列只需整段解码一次，再按长度依次切片（JS 中即一次 TextDecoder.decode），
+`python src/tools/bench.py --sizes` 中有 node 下的解码示例。网页组件目前仍读取 chaifen.json，
+构建时不生成 chaifen.bin，需要时运行 `chaifen.py --compact`。
+"""
+
+from __future__ import annotations
+
+import struct
+from itertools import accumulate
+from typing import Dict, List, Sequence
+
+MAGIC = b"CFB1"
+COLUMNS = ("name", "comp", "key")
+
+
+def _utf16_len(s: str) -> int:
+    # 增补平面的字符在 JS 中占两个码元
+    return len(s) + sum(1 for ch in s if ord(ch) > 0xFFFF)
+
+
+def encode_chaifen_bin(records: Sequence[Dict[str, str]]) -> bytes:
+    parts: List[bytes] = [MAGIC, struct.pack("<I", len(records))]
+    for col in COLUMNS:
+        values = [r[col] for r in records]
+        lengths = [_utf16_len(v) for v in values]
+        too_long = next((r for r, n in zip(records, lengths) if n > 0xFF), None)
+        if too_long is not None:
+            raise ValueError(f"{too_long['name']} 的 {col} 字段超过 255 个 UTF-16 码元，"
+                             f"无法写入 chaifen.bin：{too_long[col]!r}")
+        blob = "".join(values).encode("utf-8")
+        parts.append(struct.pack("<I", len(blob)))
+        parts.append(bytes(lengths))
+        parts.append(blob)
+    return b"".join(parts)
+
+
+def decode_chaifen_bin(data: bytes) -> List[Dict[str, str]]:
+    if data[:4] != MAGIC:
+        raise ValueError("不是 chaifen.bin 格式")
+    (count,) = struct.unpack_from("<I", data, 4)
+    pos = 8
+    columns: List[List[str]] = []
+    for _ in COLUMNS:
+        (size,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        lengths = data[pos : pos + count]
+        pos += count
+        text = data[pos : pos + size].decode("utf-8")
+        pos += size
+        offsets = [0, *accumulate(lengths)]
+        if offsets[-1] == len(text):
+            # 没有增补平面字符时，码元数即字符数，可直接切片
+            values = [text[a:b] for a, b in zip(offsets, offsets[1:])]
+        else:
+            # 否则按 UTF-16 码元切片，与浏览器端的做法一致
+            units = text.encode("utf-16-le")
+            values = [units[2 * a : 2 * b].decode("utf-16-le") for a, b in zip(offsets, offsets[1:])]
+        columns.append(values)
+    return [dict(zip(COLUMNS, row)) for row in zip(*columns)]
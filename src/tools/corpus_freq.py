@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+从本地语料统计字频（可选字对频），改写方案中的字频列。
+
+ll_fullcode.txt 的第三列与 hao_div.txt 的末列权重是现成给出的。本工具把语料文件
+用 mmap 映射后按块切开（块的边界对齐到换行符，找不到换行时对齐到 UTF-8 字符起点），
+各块分给进程池中的工作进程各自解码、计数，再在主进程中合并。每个进程一次只解码
+一块，内存占用与语料大小无关；多 GB 的语料也只需顺序读一遍。
+字对跨越块边界的极少数情况不计入。
+
+改写规则：
+- ll_fullcode.txt：第三列换成该字在语料中的出现次数；
+- hao_div.txt：末列原为小数的（hao）换成出现次数占语料中所有被统计字的比例，保留 10 位小数；
+  原为整数的（sy）换成出现次数。两种写法都与原表一致；
+语料中没有出现的字记为 0。默认写到同目录下的 *.corpus.txt，加 --in-place 时直接改写原文件。
+
+用法：
+  python src/tools/corpus_freq.py 语料 [语料 ...] [--scheme 方案目录 ...] [--jobs N]
+                                  [--chunk-mb 16] [--bigrams 输出文件] [--in-place]
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from operator import add
+from typing import Deque, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from root_convert import iter_lines, write_lines
+
+DEFAULT_CHUNK_MB = 16
+NAME_FULLCODE = "ll_fullcode.txt"
+NAME_HAO_DIV = "hao_div.txt"
+
+# 行末的权重及其后的空白
+TRAILING_WEIGHT_RE = re.compile(r"(\S+)(\s*)$")
+
+
+class Chunk(NamedTuple):
+    path: str
+    start: int
+    end: int
+
+
+class Counts(NamedTuple):
+    chars: Counter
+    bigrams: Counter
+    size: int  # 处理的字节数
+
+
+def _align(mm: mmap.mmap, pos: int, size: int) -> int:
+    """把 pos 挪到下一行的行首；附近没有换行时挪到下一个 UTF-8 字符的起点。"""
+    if pos <= 0 or pos >= size:
+        return min(max(pos, 0), size)
+    nl = mm.find(b"\n", pos, min(pos + (1 << 20), size))
+    if nl >= 0:
+        return nl + 1
+    while pos < size and (mm[pos] & 0xC0) == 0x80:
+        pos += 1
+    return pos
+
+
+def iter_chunks(path: str, chunk_size: int) -> Iterator[Chunk]:
+    size = os.path.getsize(path)
+    if size == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        start = 0
+        while start < size:
+            end = _align(mm, start + chunk_size, size)
+            yield Chunk(path, start, end)
+            start = end
+
+
+def count_chunk(chunk: Chunk, bigrams: bool = False) -> Counts:
+    """统计一块语料；字对只取相邻的两个非空白字符。"""
+    with open(chunk.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[chunk.start : chunk.end].decode("utf-8", errors="ignore")
+    chars = Counter(text)
+    pairs: Counter = Counter()
+    if bigrams:
+        pairs = Counter(map(add, text, text[1:]))
+        for pair in [p for p in pairs if p[0].isspace() or p[1].isspace()]:
+            del pairs[pair]
+    return Counts(chars, pairs, chunk.end - chunk.start)
+
+
+def _count_chunk_task(args: Tuple[Chunk, bool]) -> Counts:
+    return count_chunk(*args)
+
+
+def count_corpus(
+    paths: Sequence[str],
+    jobs: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_MB << 20,
+    bigrams: bool = False,
+    keep: Optional[Set[str]] = None,
+) -> Counts:
+    """统计若干语料文件；keep 不为 None 时只保留其中的字（字对要求两字都在其中）。"""
+    chars: Counter = Counter()
+    pairs: Counter = Counter()
+    total = 0
+
+    def merge(part: Counts) -> None:
+        nonlocal total
+        if keep is None:
+            chars.update(part.chars)
+            pairs.update(part.bigrams)
+        else:
+            chars.update({c: n for c, n in part.chars.items() if c in keep})
+            pairs.update({p: n for p, n in part.bigrams.items() if p[0] in keep and p[1] in keep})
+        total += part.size
+
+    tasks = ((chunk, bigrams) for path in paths for chunk in iter_chunks(path, chunk_size))
+    if jobs <= 1:
+        for task in tasks:
+            merge(_count_chunk_task(task))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            # 同时在途的块不超过 2 * jobs，结果按顺序合并，内存占用有上限
+            pending: Deque[Future] = deque()
+            for task in tasks:
+                pending.append(pool.submit(_count_chunk_task, task))
+                if len(pending) >= 2 * jobs:
+                    merge(pending.popleft().result())
+            while pending:
+                merge(pending.popleft().result())
+    return Counts(chars, pairs, total)
+
+
+def scheme_chars(scheme_dir: str) -> Set[str]:
+    """方案码表或拆分表中出现的字。"""
+    chars: Set[str] = set()
+    for name in (NAME_FULLCODE, NAME_HAO_DIV):
+        path = os.path.join(scheme_dir, name)
+        if os.path.exists(path):
+            for line in iter_lines(path):
+                char = line.split("\t", 1)[0].strip()
+                if char:
+                    chars.add(char)
+    return chars
+
+
+def reweight_fullcode(lines: Iterator[str], counts: Counter) -> Iterator[str]:
+    for line in lines:
+        parts = line.split("\t")
+        if len(parts) >= 3 and parts[0]:
+            parts[2] = str(counts.get(parts[0], 0))
+            line = "\t".join(parts)
+        yield line
+
+
+def reweight_hao_div(lines: Iterator[str], counts: Counter, total: int) -> Iterator[str]:
+    """逐行换掉末列权重：原为整数时写出现次数，否则写比例。"""
+    for line in lines:
+        char = line.split("\t", 1)[0].strip()
+        m = TRAILING_WEIGHT_RE.search(line) if char and "\t" in line else None
+        if m is not None:
+            count = counts.get(char, 0)
+            if m.group(1).isdigit():
+                weight = str(count)
+            else:
+                weight = f"{count / total if total else 0.0:.10f}"
+            line = line[: m.start(1)] + weight + line[m.end(1) :]
+        yield line
+
+
+def rewrite_scheme(scheme_dir: str, counts: Counter, in_place: bool = False) -> List[str]:
+    """改写方案目录下的字频列，返回写出的文件。"""
+    written: List[str] = []
+    relevant = scheme_chars(scheme_dir)
+    total = sum(n for c, n in counts.items() if c in relevant)
+    for name in (NAME_FULLCODE, NAME_HAO_DIV):
+        src = os.path.join(scheme_dir, name)
+        if not os.path.exists(src):
+            continue
+        dst = src if in_place else os.path.splitext(src)[0] + ".corpus.txt"
+        if name == NAME_FULLCODE:
+            lines = reweight_fullcode(iter_lines(src), counts)
+        else:
+            lines = reweight_hao_div(iter_lines(src), counts, total)
+        write_lines(dst, lines)
+        written.append(dst)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="从语料统计字频并改写方案的字频列")
+    parser.add_argument("corpus", nargs="+", help="UTF-8 语料文件")
+    parser.add_argument("--scheme", action="append", default=[], help="要改写的方案目录，可多次指定")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    parser.add_argument("--chunk-mb", type=int, default=DEFAULT_CHUNK_MB, help="每块的大小（MB）")
+    parser.add_argument("--bigrams", help="把字对频写到该文件（字对\\t次数）")
+    parser.add_argument("--in-place", action="store_true", help="直接改写原文件")
+    args = parser.parse_args(argv)
+
+    keep: Optional[Set[str]] = None
+    if args.scheme:
+        keep = set()
+        for scheme_dir in args.scheme:
+            keep |= scheme_chars(scheme_dir)
+
+    start = time.perf_counter()
+    counts = count_corpus(args.corpus, args.jobs, args.chunk_mb << 20, bool(args.bigrams), keep)
+    seconds = time.perf_counter() - start
+    mb = counts.size / (1 << 20)
+    print(f"语料 {mb:.1f} MB，用时 {seconds:.1f} s（{mb / seconds if seconds else 0:.1f} MB/s），"
+          f"{len(counts.chars)} 个不同字符")
+
+    if args.bigrams:
+        write_lines(args.bigrams, (f"{p}\t{n}" for p, n in counts.bigrams.most_common()))
+        print(f"已写入 {args.bigrams}（{len(counts.bigrams)} 个字对）")
+    for scheme_dir in args.scheme:
+        for path in rewrite_scheme(scheme_dir, counts.chars, args.in_place):
+            print(f"已写入 {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
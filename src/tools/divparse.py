@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+拆分表（`*_div.txt` / `*_div.real.txt`）的共用解析。
+
+每行形如：字\t构形串。构形串有两种写法：
+  a. 以空格分隔的部件，如 `口 〇`
+  b. 连续书写的部件，花括号包裹的多字部件作为整体，如 `白{在字框}丶`
+另兼容旧格式：方括号包裹的部件，如 `字 [部件]`。
+
+同一次构建中，多个生成步骤都会用到同一份拆分表。`load_div` 以
+（路径, 修改时间, 大小）为键缓存解析结果，文件只读取、切分一次。
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+
+class DivEntry(NamedTuple):
+    """拆分表中的一行。"""
+
+    char: str
+    # 制表符右侧的原始构形串；旧的方括号格式没有此项，为 None
+    rhs: Optional[str]
+    components: Tuple[str, ...]
+
+
+_CACHE: Dict[Tuple[str, int, int], List[DivEntry]] = {}
+
+# `{` 之后到第一个 `}` 为止（中间可以再出现 `{`），与逐字扫描的匹配规则一致
+BRACED_RE = re.compile(r"\{([^}]*)\}")
+
+
+def tokenize_div_rhs(rhs: str) -> List[Tuple[str, bool]]:
+    """将构形串切分为 token。
+    返回列表：[(token, is_braced)]，其中 is_braced 表示该 token 是否来自 `{...}`。
+    `{` 与其后第一个 `}` 之间的内容为一个 token；没有闭合的 `{` 按单字处理。
+
+    这里保留逐字扫描：构形串很短，耗时主要在构造 (token, bool) 元组上，
+    改用正则切分反而更慢（见 bench.py 中的 tokenize_div_rhs 项）。
+    """
+    tokens: List[Tuple[str, bool]] = []
+    i = 0
+    n = len(rhs)
+    while i < n:
+        ch = rhs[i]
+        if ch == "{":
+            j = i + 1
+            # 寻找匹配的 '}'
+            while j < n and rhs[j] != "}":
+                j += 1
+            if j < n:
+                tokens.append((rhs[i + 1 : j], True))
+                i = j + 1
+            else:
+                # 没有闭合，按单字处理 '{'
+                tokens.append((ch, False))
+                i += 1
+        else:
+            tokens.append((ch, False))
+            i += 1
+    return tokens
+
+
+def parse_zigen_sequence(sequence: str) -> List[str]:
+    """解析连续书写的字根序列，花括号内的内容作为一个字根。"""
+    if "{" not in sequence:
+        return list(sequence)
+    components: List[str] = []
+    for i, part in enumerate(BRACED_RE.split(sequence)):
+        if i % 2:
+            components.append(part)
+        else:
+            components.extend(part)
+    return components
+
+
+def split_components(rhs: str) -> List[str]:
+    """解析制表符右侧的构形串：有空格则按空格分隔，否则按连续字根序列解析。"""
+    if " " in rhs:
+        return [c for c in rhs.strip().split() if c]
+    return parse_zigen_sequence(rhs.strip())
+
+
+def merge_braced(components: Sequence[str]) -> Tuple[str, ...]:
+    """把拆分表中未转换、被拆成单字的 `{ 别 名 }` 重新合成一个部件，与字根表的写法一致。
+
+    只有以空格分隔的旧格式会出现这种拆开的花括号；root_convert 生成的连续写法中，
+    花括号部件已由 parse_zigen_sequence 整体切出，此时原样返回。
+    """
+    if "{" not in components:
+        return tuple(components)
+    merged: List[str] = []
+    buf: Optional[List[str]] = None
+    for comp in components:
+        if comp == "{" and buf is None:
+            buf = []
+        elif comp == "}" and buf is not None:
+            merged.append("{" + "".join(buf) + "}")
+            buf = None
+        elif buf is not None:
+            buf.append(comp)
+        else:
+            merged.append(comp)
+    if buf is not None:
+        merged.extend(["{", *buf])
+    return tuple(merged)
+
+
+def parse_div_line(line: str) -> Optional[DivEntry]:
+    """解析一行（应已去除首尾空白），空行返回 None。"""
+    if not line:
+        return None
+    if "\t" in line:
+        char, rhs = line.split("\t", 1)
+        return DivEntry(char, rhs, tuple(split_components(rhs)))
+
+    char = line.split()[0]
+    # 兼容旧格式：方括号包裹
+    components: List[str] = []
+    if "[" in line and "]" in line:
+        parts = line.split("[", 1)[1].split("]", 1)[0]
+        components = [t for t in parts.strip().split() if t] or list(parts.strip())
+    return DivEntry(char, None, tuple(components))
+
+
+def parse_div(path: str) -> List[DivEntry]:
+    """按文件顺序解析整份拆分表（保留重复的字）。"""
+    entries: List[DivEntry] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry = parse_div_line(line.strip())
+            if entry is not None:
+                entries.append(entry)
+    return entries
+
+
+def load_div(path: str) -> List[DivEntry]:
+    """带缓存的 `parse_div`：文件未改动时直接返回上次的解析结果。"""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    entries = _CACHE.get(key)
+    if entries is None:
+        # 同一路径只保留最新的一份
+        for old in [k for k in _CACHE if k[0] == key[0]]:
+            del _CACHE[old]
+        entries = _CACHE[key] = parse_div(path)
+    return entries
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+由字根编码推出单字全码的取码规则。
+
+字根编码为“大码 + 小码”：liuli、hao 为两码（如 `ms`），ll 为三码（如 `zpo`）。
+规则按字根编码的长度区分，记 ki 为第 i 个字根的大码，si、ti 为其小码，
+n 为末根：
+
+两码字根（liuli）：
+  一根      k1 s1
+  两根      k1 k2 s2 s1
+  三根      k1 k2 k3 s3
+  四根以上  k1 k2 k3 kn
+
+三码字根（ll）：
+  一根      k1 s1 s1 t1
+  两根      k1 k2 s1 t2
+  三根      k1 k2 k3 t3
+  四根以上  k1 k2 kn tn
+
+用 fullcode.py 对随仓库发布的 ll_div.real.txt、ll_map.real.txt 推出全码，与 ll_fullcode.txt 核对：
+- ll：推出 109744 字，全部一致；
+- liuli：推出 107006 字，一致 106875 字，不一致 131 字；另有 2738 字含字根表中没有的部件、
+  无法编码，44 字只见于 ll_fullcode.txt。
+
+hao 方案仓库中没有可核对的全码表，按两码字根的规则近似。
+
+规则写成“取码模板”：每一码是 (第几根, 取该根编码的第几位)，-1 表示末根。
+优化、反查等需要反复重算编码的地方可以只替换模板中的大码，而不必重新拼串。
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+Slot = Tuple[int, int]
+
+TEMPLATES: Dict[int, Tuple[Tuple[Slot, ...], ...]] = {
+    # 字根编码长度 -> 按字根数（1、2、3、4 及以上）排列的取码模板
+    2: (
+        ((0, 0), (0, 1)),
+        ((0, 0), (1, 0), (1, 1), (0, 1)),
+        ((0, 0), (1, 0), (2, 0), (2, 1)),
+        ((0, 0), (1, 0), (2, 0), (-1, 0)),
+    ),
+    3: (
+        ((0, 0), (0, 1), (0, 1), (0, 2)),
+        ((0, 0), (1, 0), (0, 1), (1, 2)),
+        ((0, 0), (1, 0), (2, 0), (2, 2)),
+        ((0, 0), (1, 0), (-1, 0), (-1, 2)),
+    ),
+}
+
+
+def code_template(root_count: int, width: int) -> Tuple[Slot, ...]:
+    """root_count 个字根、字根编码长 width 时的取码模板。"""
+    if root_count < 1:
+        raise ValueError("至少需要一个字根")
+    try:
+        templates = TEMPLATES[width]
+    except KeyError:
+        raise ValueError(f"不支持长度为 {width} 的字根编码") from None
+    return templates[min(root_count, len(templates)) - 1]
+
+
+def encode_roots(root_codes: Sequence[str]) -> Optional[str]:
+    """按取码规则由各字根编码拼出全码；字根编码长度不一或不受支持时返回 None。"""
+    if not root_codes:
+        return None
+    width = len(root_codes[0])
+    if width not in TEMPLATES or any(len(c) != width for c in root_codes):
+        return None
+    return "".join(root_codes[r][i] for r, i in code_template(len(root_codes), width))
+
+
+def encode_char(components: Sequence[str], root_map: Dict[str, Dict[str, Optional[str]]]) -> Optional[str]:
+    """由拆分部件和 read_ll_map / read_hao_map 的结果求全码；有部件不在字根表中时返回 None。"""
+    codes: List[str] = []
+    for comp in components:
+        entry = root_map.get(comp)
+        if entry is None:
+            return None
+        codes.append(entry["key"] + (entry["secondary"] or ""))
+    return encode_roots(codes)
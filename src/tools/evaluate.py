@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+单字测评：由码表计算 `src/evaluation.md` 中各列指标。
+
+输入码表每行形如：字\t编码\t字频（即 ll_fullcode.txt 的格式）。
+也可用 `--freq-from` 指定另一份字频来源（如 hao_div.txt 末列的权重），覆盖码表中的字频。
+
+指标定义：
+- 支持字数：码表中的不同字数。
+- 前N选重数：字频前 N 的字中，不是其编码首选的字数（同码字按字频从高到低排列）。
+- 前N动重：上述选重字的字频之和占前 N 字总字频的比例，单位 ‱。
+- 加权键长：按字频加权的平均码长。
+- 以下各项只统计码内相邻两键（键对），按字频加权：
+  - 加权键均线性当量：键对当量的加权平均。当量取自 `--pair-table` 读入的“键对\t当量”表，
+    表中须列出主键盘 30 键的全部 900 个键对；不给当量表时不计算此项（表格中记为 -）。
+  - 互击率：左右手交替的键对比例。
+  - 大跨排：同手、同指或相邻指，上排与下排之间的键对比例。
+  - 小跨排：同手、同指或相邻指，相邻两排之间的键对比例。
+  - 干扰：同手、中指与无名指或无名指与小指先后击键的键对比例（同键连击除外）。
+
+先把全部字的键对按字频累加成一张 30×30 的键对权重表，各项比例再由这张表与
+预先算好的键对分类表逐项相乘求和得到，整张码表只需遍历一次。
+仓库只用标准库，没有引入 NumPy；十一万字的码表约 0.3 s，已可在每次构建时重新计算。
+
+与 evaluation.md 的对应：
+- evaluation.md 的“全码”表不出简码，与本工具直接评测全码表相同；“简码”表是出简之后的
+  结果，本工具不计简码。
+- evaluation.md 由外部测评工具生成，其当量表与跨排、干扰的细则不在仓库中。上面的定义是
+  本工具的，只保证同一定义下各方案之间可比，数值不与 evaluation.md 逐位相同。
+- 动重与各项加权比例取决于字频。ll 的 ll_fullcode.txt 第三列是按字序递减的序数
+  （的 300000、一 299999……），并非语料字频，动重会被严重高估；与 evaluation.md 比较时
+  应以 `--freq-from src/public/sy/hao_div.txt` 换用语料字频。此时 ll 前 6000 选重 667 字、
+  动重 131.35‱，liuli 为 103 字、72.44‱。ll 全码的重码本来就多：前 6000 字的编码中
+  有 573 个被两个以上的字共用。
+
+用法：
+  python src/tools/evaluate.py 码表 [码表 ...] [--name 方案名] [--top 6000]
+                               [--freq-from 字频文件] [--pair-table 当量表] [--markdown]
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+
+# 主键盘三排，每排 10 键
+ROWS = ("qwertyuiop", "asdfghjkl;", "zxcvbnm,./")
+KEYS = "".join(ROWS)
+KEY_INDEX = {k: i for i, k in enumerate(KEYS)}
+N_KEYS = len(KEYS)
+
+# 每一列所用手指：0-3 为左手小指到食指，4-7 为右手食指到小指
+COLUMN_FINGER = (0, 1, 2, 3, 3, 4, 4, 5, 6, 7)
+# 容易相互干扰的相邻手指（中指-无名指、无名指-小指）
+WEAK_FINGER_PAIRS = {(1, 2), (0, 1), (5, 6), (6, 7)}
+
+DEFAULT_TOP = 6000
+
+
+class CodeEntry(NamedTuple):
+    char: str
+    code: str
+    freq: float
+
+
+class Report(NamedTuple):
+    name: str
+    chars: int
+    top_dups: int
+    top_dup_rate: float  # ‱
+    equivalent: Optional[float]  # 没有当量表时为 None
+    code_length: float
+    alternation: float  # 以下均为比例
+    big_jump: float
+    small_jump: float
+    interference: float
+
+
+def key_position(index: int) -> Tuple[int, int, int]:
+    """返回 (排, 手指, 手)；手 0 为左手，1 为右手。"""
+    row, col = divmod(index, 10)
+    finger = COLUMN_FINGER[col]
+    return row, finger, 0 if finger < 4 else 1
+
+
+def classify_pairs() -> Tuple[List[int], List[int], List[int], List[int]]:
+    """预先为每个键对计算分类标记：互击、大跨排、小跨排、干扰。"""
+    alternation = [0] * (N_KEYS * N_KEYS)
+    big_jump = [0] * (N_KEYS * N_KEYS)
+    small_jump = [0] * (N_KEYS * N_KEYS)
+    interference = [0] * (N_KEYS * N_KEYS)
+    for a in range(N_KEYS):
+        ra, fa, ha = key_position(a)
+        for b in range(N_KEYS):
+            rb, fb, hb = key_position(b)
+            p = a * N_KEYS + b
+            if ha != hb:
+                alternation[p] = 1
+                continue
+            if a == b:
+                continue
+            near = abs(fa - fb) <= 1
+            big_jump[p] = int(near and abs(ra - rb) == 2)
+            small_jump[p] = int(near and abs(ra - rb) == 1)
+            interference[p] = int((min(fa, fb), max(fa, fb)) in WEAK_FINGER_PAIRS)
+    return alternation, big_jump, small_jump, interference
+
+
+def parse_number(text: str, path: str, lineno: int, what: str = "字频") -> float:
+    """把数值字段转为 float；格式不对时报出文件与行号。"""
+    try:
+        return float(text)
+    except ValueError:
+        raise ValueError(f"{path}:{lineno}: {what}不是数值：{text!r}") from None
+
+
+def load_pair_table(path: str) -> List[float]:
+    """读取“键对\t当量”格式的当量表；主键盘 30 键的键对缺任何一个都报错。"""
+    table: List[Optional[float]] = [None] * (N_KEYS * N_KEYS)
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            parts = line.strip().split("\t")
+            if len(parts) < 2 or len(parts[0]) != 2:
+                continue
+            a, b = (KEY_INDEX.get(k) for k in parts[0].lower())
+            if a is not None and b is not None:
+                table[a * N_KEYS + b] = parse_number(parts[1], path, lineno, "当量")
+    missing = [KEYS[p // N_KEYS] + KEYS[p % N_KEYS] for p, v in enumerate(table) if v is None]
+    if missing:
+        raise ValueError(f"{path}: 当量表缺少 {len(missing)} 个键对，如 {' '.join(missing[:5])}")
+    return [v for v in table if v is not None]
+
+
+def iter_code_table(path: str) -> Iterator[CodeEntry]:
+    """逐行读取码表；同一字出现多次时只取第一次（首要编码）。"""
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 2 or not parts[0] or parts[0] in seen:
+                continue
+            seen.add(parts[0])
+            freq = parse_number(parts[2], path, lineno) if len(parts) > 2 and parts[2].strip() else 0.0
+            yield CodeEntry(parts[0], parts[1].lower(), freq)
+
+
+def load_weights(path: str) -> Dict[str, float]:
+    """读取字频：每行以字开头、以数值结尾（兼容 hao_div.txt 与 ll_fullcode.txt）。"""
+    weights: Dict[str, float] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            try:
+                weights.setdefault(parts[0], float(parts[-1]))
+            except ValueError:
+                continue
+    return weights
+
+
+def pair_histogram(entries: Sequence[CodeEntry]) -> Tuple[List[float], float, float]:
+    """按字频累加码内相邻键对，返回 (键对权重表, 总字频, 按字频加权的码长之和)。"""
+    hist = [0.0] * (N_KEYS * N_KEYS)
+    total = 0.0
+    length = 0.0
+    for _char, code, freq in entries:
+        total += freq
+        length += freq * len(code)
+        prev: Optional[int] = None
+        for k in code:
+            cur = KEY_INDEX.get(k)
+            if prev is not None and cur is not None:
+                hist[prev * N_KEYS + cur] += freq
+            prev = cur
+    return hist, total, length
+
+
+def duplicate_stats(entries: Sequence[CodeEntry], top: int) -> Tuple[int, float]:
+    """前 top 字的选重数与动重（‱）。"""
+    # 同码内按字频从高到低确定首选；字频相同时码表中靠前的优先
+    best: Dict[str, Tuple[float, int]] = {}
+    for i, (_char, code, freq) in enumerate(entries):
+        cur = best.get(code)
+        if cur is None or freq > cur[0]:
+            best[code] = (freq, i)
+
+    ranked = heapq.nlargest(top, range(len(entries)), key=lambda i: entries[i].freq)
+    dups = 0
+    dup_freq = 0.0
+    top_freq = 0.0
+    for i in ranked:
+        entry = entries[i]
+        top_freq += entry.freq
+        if best[entry.code][1] != i:
+            dups += 1
+            dup_freq += entry.freq
+    rate = dup_freq / top_freq * 10000 if top_freq else 0.0
+    return dups, rate
+
+
+def evaluate(
+    entries: Sequence[CodeEntry],
+    name: str = "",
+    top: int = DEFAULT_TOP,
+    pair_table: Optional[List[float]] = None,
+) -> Report:
+    alternation, big_jump, small_jump, interference = classify_pairs()
+
+    hist, total, length = pair_histogram(entries)
+    pairs = sum(hist)
+
+    def ratio(flags: List[int]) -> float:
+        return sum(w for w, f in zip(hist, flags) if f) / pairs if pairs else 0.0
+
+    dups, dup_rate = duplicate_stats(entries, top)
+    return Report(
+        name=name,
+        chars=len(entries),
+        top_dups=dups,
+        top_dup_rate=dup_rate,
+        equivalent=(sum(w * e for w, e in zip(hist, pair_table)) / pairs if pairs else 0.0)
+        if pair_table is not None else None,
+        code_length=length / total if total else 0.0,
+        alternation=ratio(alternation),
+        big_jump=ratio(big_jump),
+        small_jump=ratio(small_jump),
+        interference=ratio(interference),
+    )
+
+
+def markdown_header(top: int = DEFAULT_TOP) -> str:
+    return (
+        f"| 方案 | 支持字数 | 前{top}选重数 | 前{top}动重 | 加权键均线性当量 | 加权键长 "
+        "| 互击率 | 大跨排 | 小跨排 | 干扰 |\n"
+        "| --- | --- | --- | --- | --- | --- | --- | --- | --- | --- |"
+    )
+
+
+def markdown_row(r: Report) -> str:
+    """格式与 evaluation.md 中的表格一致。"""
+    def pct(x: float) -> str:
+        return f"{round(x * 100, 2)}%"
+
+    equivalent = "-" if r.equivalent is None else round(r.equivalent, 4)
+    return (
+        f"| {r.name} | {r.chars} | {r.top_dups} | {round(r.top_dup_rate, 2)}‱ "
+        f"| {equivalent} | {round(r.code_length, 2)} | {pct(r.alternation)} "
+        f"| {pct(r.big_jump)} | {pct(r.small_jump)} | {pct(r.interference)} |"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="单字测评")
+    parser.add_argument("tables", nargs="+", help="码表文件（字\\t编码\\t字频）")
+    parser.add_argument("--name", action="append", default=[], help="方案名，与码表依次对应")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="统计选重的前 N 字")
+    parser.add_argument("--freq-from", help="另取字频的文件，如 hao_div.txt")
+    parser.add_argument("--pair-table", help="键对当量表（键对\\t当量）")
+    parser.add_argument("--markdown", action="store_true", help="输出 evaluation.md 格式的表格")
+    args = parser.parse_args()
+
+    weights = load_weights(args.freq_from) if args.freq_from else None
+    try:
+        pair_table = load_pair_table(args.pair_table) if args.pair_table else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    reports = []
+    for i, path in enumerate(args.tables):
+        try:
+            entries = list(iter_code_table(path))
+        except ValueError as e:
+            parser.error(str(e))
+        if weights is not None:
+            entries = [e._replace(freq=weights.get(e.char, 0.0)) for e in entries]
+        name = args.name[i] if i < len(args.name) else os.path.basename(os.path.dirname(os.path.abspath(path)))
+        reports.append(evaluate(entries, name, args.top, pair_table))
+
+    if args.markdown:
+        print(markdown_header(args.top))
+        for r in reports:
+            print(markdown_row(r))
+        return
+    for r in reports:
+        print(f"{r.name}:")
+        print(f"  支持字数          {r.chars}")
+        print(f"  前{args.top}选重数     {r.top_dups}")
+        print(f"  前{args.top}动重       {r.top_dup_rate:.2f}‱")
+        print(f"  加权键均线性当量  {'未给当量表' if r.equivalent is None else f'{r.equivalent:.4f}'}")
+        print(f"  加权键长          {r.code_length:.2f}")
+        print(f"  互击率            {r.alternation:.2%}")
+        print(f"  大跨排            {r.big_jump:.2%}")
+        print(f"  小跨排            {r.small_jump:.2%}")
+        print(f"  干扰              {r.interference:.2%}")
+
+
+if __name__ == "__main__":
+    main()
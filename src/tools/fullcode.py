@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+由拆分表与字根表推导全码，并与随方案提供的 ll_fullcode.txt 核对。
+
+ll_fullcode.txt 是现成给出的，ll_map.txt 改动之后构建无法验证或重新生成它。
+本工具读取 ll_div.real.txt 与 ll_map.real.txt，按 encode.py 的取码规则为每个字推出全码
+（与 searchReformat.ts 一致：全码依次对应各字根，多出的码归末根），并报告：
+- 推出的全码不在 ll_fullcode.txt 该字编码之中的字；
+- 含有字根表中没有的部件、无法编码的字（以及这些部件）；
+- 只在 ll_fullcode.txt 中出现、拆分表里没有的字。
+
+核对的是随仓库发布的 ll_div.real.txt、ll_map.real.txt，与 chaifen.json 等用的是同一份表。
+加 --refresh 时，若它们比 ll_div.txt、ll_map.txt 或 PUAtoalias.txt 旧，先用 root_convert
+重新生成再核对（会覆盖发布的表，与 build.py --with convert_div --with convert_map 相同）。
+按发布的表核对，ll 推出 109744 字全部一致；liuli 推出 107006 字，不一致 131 字，
+无法编码 2738 字，仅见于 ll_fullcode.txt 44 字。
+
+编码按列进行：先把每个字根的编码查好，字按字根数分组，同组的字共用一个取码模板，
+每个模板位置取出一整列字符，再逐行拼接，整张表只需遍历几次列表。
+
+用法：
+  python src/tools/fullcode.py [方案目录] [--write] [--limit 20] [--refresh]
+  --write 时把推出的码表写到方案目录下的 ll_fullcode.derived.txt（字\\t编码\\t字频）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from divparse import load_div, merge_braced
+from encode import TEMPLATES, code_template
+from generate_zigen import DEFAULT_SCHEME_DIR, read_ll_map
+from profiling import phase
+from root_convert import NAME_PUA, convert_div_file, convert_map_file, write_lines
+
+NAME_DIV = "ll_div.real.txt"
+NAME_MAP = "ll_map.real.txt"
+NAME_FULLCODE = "ll_fullcode.txt"
+NAME_DIV_SOURCE = "ll_div.txt"
+NAME_MAP_SOURCE = "ll_map.txt"
+OUT_DERIVED = "ll_fullcode.derived.txt"
+
+
+class Mismatch(NamedTuple):
+    char: str
+    components: Tuple[str, ...]
+    derived: str
+    shipped: Tuple[str, ...]
+
+
+class FullcodeReport(NamedTuple):
+    derived: List[Tuple[str, str]]  # (字, 推出的全码)，按拆分表顺序
+    matched: int
+    mismatches: List[Mismatch]
+    unencodable: List[str]
+    missing_roots: Counter
+    shipped_only: List[str]
+
+
+def load_root_codes(path: str) -> Dict[str, str]:
+    """字根 -> 完整的字根编码（大码 + 小码）。"""
+    root_map, _ = read_ll_map(path)
+    return {root: entry["key"] + (entry["secondary"] or "") for root, entry in root_map.items()}
+
+
+def read_fullcode(path: str) -> Dict[str, List[str]]:
+    """字 -> 该字在 ll_fullcode.txt 中的全部编码（按出现顺序）。"""
+    codes: Dict[str, List[str]] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2 and parts[0]:
+                codes.setdefault(parts[0], []).append(parts[1].lower())
+    return codes
+
+
+def encode_table(
+    entries: Sequence[Tuple[str, Tuple[str, ...]]], root_codes: Dict[str, str]
+) -> Tuple[List[Optional[str]], Counter]:
+    """按列为整张表编码，返回与 entries 对应的全码（无法编码为 None）及缺失部件的计数。"""
+    codes: List[Optional[str]] = [None] * len(entries)
+    missing: Counter = Counter()
+    # (字根编码长度, 字根数档位) -> [(行号, 各字根编码)]
+    groups: Dict[Tuple[int, int], List[Tuple[int, List[str]]]] = {}
+    for row, (_char, comps) in enumerate(entries):
+        roots = [root_codes.get(comp) for comp in comps]
+        if not roots or None in roots:
+            missing.update(comp for comp, code in zip(comps, roots) if code is None)
+            continue
+        width = len(roots[0])
+        if width not in TEMPLATES or any(len(code) != width for code in roots):
+            continue
+        groups.setdefault((width, min(len(roots), len(TEMPLATES[width]))), []).append((row, roots))
+
+    for (width, count), members in groups.items():
+        columns = [
+            [roots[r][i] for _, roots in members]
+            for r, i in code_template(count, width)
+        ]
+        for (row, _), code in zip(members, map("".join, zip(*columns))):
+            codes[row] = code
+    return codes, missing
+
+
+def derive_fullcode(scheme_dir: str) -> FullcodeReport:
+    with phase("load"):
+        root_codes = load_root_codes(os.path.join(scheme_dir, NAME_MAP))
+        shipped = read_fullcode(os.path.join(scheme_dir, NAME_FULLCODE))
+    with phase("tokenize"):
+        entries = [(e.char, merge_braced(e.components)) for e in load_div(os.path.join(scheme_dir, NAME_DIV))]
+    with phase("map"):
+        codes, missing = encode_table(entries, root_codes)
+
+    derived: List[Tuple[str, str]] = []
+    # 同一字有多种拆分时，任一拆分推出的全码在 ll_fullcode.txt 中即算一致
+    status: Dict[str, Optional[bool]] = {}
+    candidates: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+    for (char, comps), code in zip(entries, codes):
+        if code is None:
+            status.setdefault(char, None)
+            continue
+        derived.append((char, code))
+        candidates.setdefault(char, []).append((comps, code))
+        if char in shipped:
+            status[char] = status.get(char) or code in shipped[char]
+
+    mismatches = [
+        Mismatch(char, *candidates[char][0], tuple(shipped[char]))
+        for char, ok in status.items()
+        if ok is False
+    ]
+    return FullcodeReport(
+        derived=derived,
+        matched=sum(1 for ok in status.values() if ok),
+        mismatches=mismatches,
+        unencodable=[char for char, ok in status.items() if ok is None],
+        missing_roots=missing,
+        shipped_only=[char for char in shipped if char not in status],
+    )
+
+
+def summarize(report: FullcodeReport) -> str:
+    return (
+        f"推出 {len(report.derived)} 条，一致 {report.matched} 字，不一致 {len(report.mismatches)} 字，"
+        f"无法编码 {len(report.unencodable)} 字，仅见于 {NAME_FULLCODE} {len(report.shipped_only)} 字"
+    )
+
+
+def check_fullcode(scheme_dir: str) -> None:
+    """构建步骤：只报告核对结果，不写文件。"""
+    print(f"  {summarize(derive_fullcode(scheme_dir))}")
+
+
+def write_derived(scheme_dir: str, report: FullcodeReport) -> str:
+    """按 ll_fullcode.txt 的格式写出推出的码表，字频沿用原表。"""
+    freq: Dict[str, str] = {}
+    with open(os.path.join(scheme_dir, NAME_FULLCODE), "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 3:
+                freq.setdefault(parts[0], parts[2])
+    path = os.path.join(scheme_dir, OUT_DERIVED)
+    write_lines(path, (f"{char}\t{code}\t{freq.get(char, '0')}" for char, code in report.derived))
+    return path
+
+
+def refresh_converted(scheme_dir: str) -> List[str]:
+    """转换结果比其源文件旧时重新生成，返回重新生成的文件名。"""
+    def mtime(name: str) -> float:
+        path = os.path.join(scheme_dir, name)
+        return os.path.getmtime(path) if os.path.exists(path) else -1.0
+
+    refreshed: List[str] = []
+    for out, source, convert in (
+        (NAME_DIV, NAME_DIV_SOURCE, convert_div_file),
+        (NAME_MAP, NAME_MAP_SOURCE, convert_map_file),
+    ):
+        sources = [mtime(source), mtime(NAME_PUA)]
+        if min(sources) >= 0 and mtime(out) < max(sources):
+            convert(scheme_dir)
+            refreshed.append(out)
+    return refreshed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="由拆分表与字根表推导全码并核对")
+    parser.add_argument("scheme_dir", nargs="?", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--write", action="store_true", help=f"写出 {OUT_DERIVED}")
+    parser.add_argument("--limit", type=int, default=20, help="每类最多列出的条目数")
+    parser.add_argument("--refresh", action="store_true",
+                        help=f"{NAME_DIV} 等比源文件旧时先重新生成（覆盖发布的表）")
+    args = parser.parse_args(argv)
+    if args.refresh:
+        for name in refresh_converted(args.scheme_dir):
+            print(f"{name} 比源文件旧，已重新生成")
+    for name in (NAME_DIV, NAME_MAP, NAME_FULLCODE):
+        if not os.path.exists(os.path.join(args.scheme_dir, name)):
+            parser.error(f"方案目录中没有 {name}")
+
+    report = derive_fullcode(args.scheme_dir)
+    print(summarize(report))
+    if report.mismatches:
+        print("不一致：")
+        for m in report.mismatches[: args.limit]:
+            print(f"  {m.char}\t{' '.join(m.components)}\t推出 {m.derived}\t原表 {' '.join(m.shipped)}")
+    if report.missing_roots:
+        print("字根表中没有的部件：")
+        for comp, n in report.missing_roots.most_common(args.limit):
+            print(f"  {comp!r}\t{n} 次")
+    if report.shipped_only:
+        print(f"仅见于 {NAME_FULLCODE}：{''.join(report.shipped_only[: args.limit])}")
+    if args.write:
+        print(f"已写入 {write_derived(args.scheme_dir, report)}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
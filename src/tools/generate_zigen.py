@@ -0,0 +1,164 @@
+import json
+import os
+import sys
+
+from divparse import load_div
+from profiling import phase
+from rootindex import EXAMPLES_PER_ZIGEN, RootIndex
+
+DEFAULT_SCHEME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'liuli')
+
+def read_ll_map(file_path):
+    """读取ll_map.real.txt文件，返回字根到编码的映射和字根顺序列表"""
+    ll_map = {}
+    zigen_order = []  # 保持字根出现的顺序
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            # 分离编码和字根序列
+            parts = line.split('\t')
+            if len(parts) < 2:
+                continue
+                
+            code, zigen_sequence = parts[0], parts[1]
+            
+            # ll_map.real.txt中使用空格分隔字根
+            components = [c for c in zigen_sequence.split() if c]
+            
+            # 为每个字根分配编码
+            for component in components:
+                if component not in ll_map:
+                    # 将编码转换为小写
+                    code_lower = code.lower()
+                    ll_map[component] = {
+                        'key': code_lower[0], 
+                        'secondary': code_lower[1:] if len(code_lower) > 1 else None
+                    }
+                    # 记录字根出现的顺序
+                    zigen_order.append(component)
+    
+    return ll_map, zigen_order
+
+def read_char_frequency(file_path):
+    """读取ll_fullcode.txt第三列字频，返回 {汉字: 字频}；文件不存在时返回None"""
+    if not os.path.exists(file_path):
+        return None
+    freq = {}
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) >= 3 and parts[0] not in freq:
+                try:
+                    freq[parts[0]] = float(parts[2])
+                except ValueError:
+                    continue
+    return freq
+
+def read_ll_div(file_path, char_frequency=None, k=EXAMPLES_PER_ZIGEN):
+    """读取ll_div.real.txt文件，返回字根倒排表（见 rootindex.RootIndex），附带字根使用频率
+    给出char_frequency时，每个字根取字频最高的k个例字；否则取文件中最先出现的k个"""
+    root_index = RootIndex(k)
+    
+    # 拆分表在同一次构建中只解析一次，见 divparse.load_div
+    for order, (char, _rhs, components) in enumerate(load_div(file_path)):
+        weight = char_frequency.get(char, 0) if char_frequency is not None else 0
+        root_index.add(order, char, weight, components)
+    
+    # 打印调试信息
+    print(f"读取到的字根数量: {len(root_index)}")
+    print("前10个字根及其相关字示例:")
+    for zigen in root_index.roots()[:10]:
+        print(f"{zigen}: {root_index.examples([zigen])}")
+            
+    return root_index
+
+# (拆分表, 字频表, k) 的文件状态 -> 字根倒排表
+_INDEX_CACHE = {}
+
+def _file_key(path):
+    if not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
+def load_root_index(ll_div_path, fullcode_path, k=EXAMPLES_PER_ZIGEN):
+    """带缓存的 read_char_frequency + read_ll_div：两个文件都未改动时直接返回上次的倒排表。
+    zigen1.json 与 zigen.json 共用同一份；在同一进程里反复构建（如 watch.py）时，
+    只改字根表也不必重新统计例字"""
+    key = (_file_key(ll_div_path), _file_key(fullcode_path), k)
+    root_index = _INDEX_CACHE.get(key)
+    if root_index is None:
+        # 同一拆分表只保留最新的一份
+        for old in [c for c in _INDEX_CACHE if c[0][0] == key[0][0]]:
+            del _INDEX_CACHE[old]
+        char_frequency = read_char_frequency(fullcode_path)
+        root_index = _INDEX_CACHE[key] = read_ll_div(ll_div_path, char_frequency, k)
+    return root_index
+
+def generate_zigen_json(ll_map, zigen_order, root_index):
+    """生成zigen.json格式的数据，按照ll_map.real.txt中的字根顺序"""
+    result = []
+    
+    # 按照ll_map.real.txt中的字根顺序
+    for zigen in zigen_order:
+        if zigen not in ll_map:
+            continue
+            
+        code_info = ll_map[zigen]
+        
+        # 获取相关汉字；组合字根（包含空格）取各子字根倒排表合并后字频最高的几个
+        related_chars = root_index.examples(zigen.split())
+        
+        item = {
+            'name': zigen,
+            'rel': related_chars,
+            'key': code_info['key'],
+            'secondary': code_info['secondary']
+        }
+        result.append(item)
+    
+    # 打印调试信息
+    print(f"\n生成的JSON数据数量: {len(result)}")
+    print("前5个字根数据示例:")
+    for i, item in enumerate(result[:5]):
+        print(f"{item['name']}: key='{item['key']}', secondary='{item['secondary']}', rel='{item['rel'][:20]}...'")
+    
+    return result
+
+def build_zigen(scheme_dir=DEFAULT_SCHEME_DIR, output_name='zigen1.json'):
+    """由方案目录下的 ll_map.real.txt 与 ll_div.real.txt 生成字根表"""
+    # 文件路径
+    ll_map_path = os.path.join(scheme_dir, 'll_map.real.txt')
+    ll_div_path = os.path.join(scheme_dir, 'll_div.real.txt')
+    output_path = os.path.join(scheme_dir, output_name)
+    
+    # 读取数据
+    with phase('load'):
+        ll_map, zigen_order = read_ll_map(ll_map_path)
+    with phase('tokenize'):
+        # 先解析拆分表（有缓存，read_ll_div 中不会再解析），以便分开计时
+        load_div(ll_div_path)
+    with phase('aggregate'):
+        # 拆分表与字频表都未改动时取上次的倒排表
+        root_index = load_root_index(ll_div_path, os.path.join(scheme_dir, 'll_fullcode.txt'))
+    
+    # 生成JSON数据
+    with phase('map'):
+        zigen_data = generate_zigen_json(ll_map, zigen_order, root_index)
+    
+    # 写入文件
+    with phase('serialize'), open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(zigen_data, f, ensure_ascii=False, indent=4)
+    
+    print(f"\n已成功生成 {output_path}")
+
+def main():
+    # 用法：python src/tools/generate_zigen.py [方案目录]
+    build_zigen(*sys.argv[1:2])
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
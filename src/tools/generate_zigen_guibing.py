@@ -0,0 +1,109 @@
+import json
+import os
+import sys
+
+import generate_zigen
+from divparse import load_div
+from generate_zigen import DEFAULT_SCHEME_DIR, load_root_index
+from profiling import phase
+
+def read_ll_map(file_path):
+    """读取ll_map.real.txt文件，返回字根到编码的映射和字根顺序列表"""
+    ll_map = {}
+    zigen_order = []  # 保持字根出现的顺序
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            
+            # 分离编码和字根序列
+            parts = line.split('\t')
+            if len(parts) < 2:
+                continue
+                
+            code, zigen_sequence = parts[0], parts[1]
+            
+            # ll_map.real.txt中使用空格分隔字根，但这是一个组合字根，不应该拆分
+            # 直接将整个序列作为一个字根
+            combined_zigen = zigen_sequence
+            
+            if combined_zigen not in ll_map:
+                # 将编码转换为小写
+                code_lower = code.lower()
+                ll_map[combined_zigen] = {
+                    'key': code_lower[0], 
+                    'secondary': code_lower[1:] if len(code_lower) > 1 else None
+                }
+                # 记录字根出现的顺序
+                zigen_order.append(combined_zigen)
+    
+    return ll_map, zigen_order
+
+def generate_zigen_json(ll_map, zigen_order, root_index):
+    """生成zigen.json格式的数据，按照ll_map.real.txt中的字根顺序"""
+    result = []
+    
+    # 按照ll_map.real.txt中的字根顺序
+    for zigen in zigen_order:
+        code_info = ll_map[zigen]
+        
+        # 获取相关汉字；组合字根（包含空格）取各子字根倒排表的并集中字频最高的几个，
+        # 与单个字根的例字排法一致
+        related_chars = root_index.examples(zigen.split())
+        
+        item = {
+            'name': zigen,
+            'rel': related_chars,
+            'key': code_info['key'],
+            'secondary': code_info['secondary']
+        }
+        result.append(item)
+    
+    # 打印调试信息
+    print(f"\n生成的JSON数据数量: {len(result)}")
+    print("前5个字根数据示例:")
+    for i, item in enumerate(result[:5]):
+        print(f"{item['name']}: key='{item['key']}', secondary='{item['secondary']}', rel='{item['rel'][:20]}...'")
+    
+    return result
+
+def build_zigen(scheme_dir=DEFAULT_SCHEME_DIR, output_name='zigen.json'):
+    """由方案目录下的 ll_map.real.txt 与 ll_div.real.txt 生成归并字根表"""
+    # 文件路径
+    ll_map_path = os.path.join(scheme_dir, 'll_map.real.txt')
+    ll_div_path = os.path.join(scheme_dir, 'll_div.real.txt')
+    output_path = os.path.join(scheme_dir, output_name)
+    
+    # 读取数据
+    with phase('load'):
+        ll_map, zigen_order = read_ll_map(ll_map_path)
+    with phase('tokenize'):
+        # 先解析拆分表（有缓存，read_ll_div 中不会再解析），以便分开计时
+        load_div(ll_div_path)
+    with phase('aggregate'):
+        # 与 zigen1.json 共用同一份倒排表，已建好时直接取用
+        root_index = load_root_index(ll_div_path, os.path.join(scheme_dir, 'll_fullcode.txt'))
+    
+    # 生成JSON数据
+    with phase('map'):
+        zigen_data = generate_zigen_json(ll_map, zigen_order, root_index)
+    
+    # 写入文件
+    with phase('serialize'), open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(zigen_data, f, ensure_ascii=False, indent=4)
+    
+    print(f"\n已成功生成 {output_path}")
+
+def build_zigen_all(scheme_dir=DEFAULT_SCHEME_DIR):
+    """由同一份字根倒排表一次生成 zigen1.json（逐个字根）与 zigen.json（归并字根）"""
+    generate_zigen.build_zigen(scheme_dir)
+    build_zigen(scheme_dir)
+
+def main():
+    # 用法：python src/tools/generate_zigen_guibing.py [方案目录]
+    build_zigen(*sys.argv[1:2])
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
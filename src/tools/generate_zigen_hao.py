@@ -1,7 +1,13 @@
 import json
-import re
+import os
+import sys
 from collections import defaultdict
 
+from rootindex import EXAMPLES_PER_ZIGEN, heap_to_examples, push_example
+from profiling import phase
+
+DEFAULT_SCHEME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'public', 'hao')
+
 def read_hao_map(file_path):
     """读取hao_map.txt文件，返回字根到编码的映射"""
     hao_map = {}
@@ -28,13 +34,21 @@ def extract_components(line):
     components = list(parts)
     return components
 
-def read_hao_div(file_path):
-    """读取hao_div.txt文件，返回字根到相关汉字的映射和字根使用频率"""
-    zigen_to_chars = defaultdict(list)  # 改为list以保持顺序
+def extract_weight(line):
+    """取行末的权重（字频），没有则为0"""
+    try:
+        return float(line.rsplit(None, 1)[-1])
+    except ValueError:
+        return 0.0
+
+def read_hao_div(file_path, k=EXAMPLES_PER_ZIGEN):
+    """读取hao_div.txt文件，返回字根到相关汉字的映射和字根使用频率
+    每个字根取行末权重最高的k个例字，边读边放入容量为k的堆，不保留整张表"""
+    zigen_heaps = defaultdict(list)
     zigen_frequency = defaultdict(int)
     
     with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
+        for order, line in enumerate(f):
             line = line.strip()
             if not line:
                 continue
@@ -42,16 +56,18 @@ def read_hao_div(file_path):
             # 获取汉字和它的部件
             char = line.split()[0]
             components = extract_components(line)
+            weight = extract_weight(line)
             
-            # 将汉字添加到每个部件的相关字列表中，最多10个
             for component in components:
                 if component:  # 忽略空部件
-                    if len(zigen_to_chars[component]) < 10:  # 只保留前10个
-                        zigen_to_chars[component].append(char)
                     zigen_frequency[component] += 1
+            # 同一字里重复的部件只算一次例字
+            for component in dict.fromkeys(components):
+                if component:
+                    push_example(zigen_heaps[component], weight, order, char, k)
     
-    # 将列表转换为字符串
-    zigen_to_chars = {k: ''.join(v) for k, v in zigen_to_chars.items()}
+    # 将堆转换为字符串
+    zigen_to_chars = {k: heap_to_examples(v) for k, v in zigen_heaps.items()}
     
     # 打印调试信息
     print(f"读取到的字根数量: {len(zigen_to_chars)}")
@@ -91,22 +107,31 @@ def generate_zigen_json(hao_map, zigen_to_chars, zigen_frequency):
     
     return result
 
-def main():
+def build_zigen(scheme_dir=DEFAULT_SCHEME_DIR, output_name='zigen-xi.json'):
+    """由方案目录下的 hao_map.txt 与 hao_div.txt 生成字根表"""
     # 文件路径
-    hao_map_path = 'src/public/sy/hao_map.txt'
-    hao_div_path = 'src/public/sy/hao_div.txt'
-    output_path = 'src/public/sy/zigen.json'
+    hao_map_path = os.path.join(scheme_dir, 'hao_map.txt')
+    hao_div_path = os.path.join(scheme_dir, 'hao_div.txt')
+    output_path = os.path.join(scheme_dir, output_name)
     
     # 读取数据
-    hao_map = read_hao_map(hao_map_path)
-    zigen_to_chars, zigen_frequency = read_hao_div(hao_div_path)
+    with phase('load'):
+        hao_map = read_hao_map(hao_map_path)
+    # hao_div.txt 边读边切分、统计，不单独计 tokenize
+    with phase('aggregate'):
+        zigen_to_chars, zigen_frequency = read_hao_div(hao_div_path)
     
     # 生成JSON数据
-    zigen_data = generate_zigen_json(hao_map, zigen_to_chars, zigen_frequency)
+    with phase('map'):
+        zigen_data = generate_zigen_json(hao_map, zigen_to_chars, zigen_frequency)
     
     # 写入文件
-    with open(output_path, 'w', encoding='utf-8') as f:
+    with phase('serialize'), open(output_path, 'w', encoding='utf-8') as f:
         json.dump(zigen_data, f, ensure_ascii=False, indent=4)
 
+def main():
+    # 用法：python src/tools/generate_zigen_hao.py [方案目录] [输出文件名]
+    build_zigen(*sys.argv[1:3])
+
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+按字频分配一、二、三简。
+
+输入为全码表（ll_fullcode.txt：字\t全码\t字频）。一个字的 n 简取其全码的前 n 码，
+每个字至多分到一个简码；每个简码位可放的字数由 `--slots` 指定（默认各一个，
+设为 0 表示不出该级简码）。同一码位上第 k 个字（从 0 起）需多按 k 次选重键。
+长度不超过 3 的全码本身就占着对应的码位（作为首选），分配时先扣除。
+
+目标是按字频加权的节省击键数最大：一个字分到 n 简，第 k 位，节省
+字频 × (全码长 - n - k)。求解用贪心加腾挪，各步比较的都是按选重位置计算的总节省：
+1. 把所有 (字, 简码) 候选按“放在第一个空位时的节省”从大到小排列，逐个放入仍有空位的码位；
+2. 再按同样顺序，对没分到简码的字看能否把位上某个字挪到它自己另一个仍有空位的简码，
+   总节省增加则挪动。这一步只用贪心剩下的空位，结果不会比单用贪心差。
+十万字的码表在几秒内完成。
+
+输出（默认写在方案目录下）：
+- jianma.txt：字\t简码\t字频，同一简码按选重顺序排列，可直接用作码表；
+- jianma.json：[{name, key}]，按编码排序，字段与 HanziCard 一致，可与 chaifen.json 一起供
+  网站和输入法组件使用。
+
+用法：
+  python src/tools/jianma.py [方案目录] [--slots 1=1,2=1,3=1] [--output-dir 目录]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from evaluate import CodeEntry, iter_code_table
+from generate_zigen import DEFAULT_SCHEME_DIR
+from profiling import phase
+from root_convert import write_lines
+
+NAME_FULLCODE = "ll_fullcode.txt"
+OUT_TXT = "jianma.txt"
+OUT_JSON = "jianma.json"
+DEFAULT_SLOTS = {1: 1, 2: 1, 3: 1}
+
+
+class ShortCode(NamedTuple):
+    char: str
+    code: str
+    rank: int  # 同一简码内的选重位置，0 为首选
+    freq: float
+    saving: float
+
+
+def parse_slots(text: str) -> Dict[int, int]:
+    """解析 "1=1,2=1,3=2" 形式的码位规则。"""
+    slots: Dict[int, int] = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        length, sep, count = item.partition("=")
+        if not sep:
+            raise ValueError(f"码位规则应写作 码长=字数：{item}")
+        slots[int(length)] = int(count)
+    if any(n < 1 for n in slots) or any(c < 0 for c in slots.values()):
+        raise ValueError(f"码位规则无效：{text}")
+    return slots
+
+
+def allocate(entries: Sequence[CodeEntry], slots: Dict[int, int], relocate: bool = True) -> List[ShortCode]:
+    """按字频分配简码，返回按简码、选重顺序排列的结果；relocate 为假时只做贪心。"""
+    # 简码 -> 剩余容量；长度相同的全码先占位
+    capacity: Dict[str, int] = {}
+    occupied: Dict[str, int] = {}
+    for e in entries:
+        if len(e.code) in slots:
+            occupied[e.code] = occupied.get(e.code, 0) + 1
+
+    def room(code: str) -> int:
+        if code not in capacity:
+            capacity[code] = max(slots[len(code)] - occupied.get(code, 0), 0)
+        return capacity[code]
+
+    def layout(code: str, members: Sequence[int]) -> List[Tuple[int, int, float]]:
+        """code 上各字按字频排出选重位置，返回 [(字, 位置, 节省)]；节省不为正的字不出简码、不占位置。"""
+        placed: List[Tuple[int, int, float]] = []
+        rank = occupied.get(code, 0)
+        for j in sorted(members, key=lambda j: (-entries[j].freq, j)):
+            e = entries[j]
+            saving = e.freq * (len(e.code) - len(code) - rank)
+            if saving > 0:
+                placed.append((j, rank, saving))
+                rank += 1
+        return placed
+
+    def total(code: str, members: Sequence[int]) -> float:
+        return sum(saving for _, _, saving in layout(code, members))
+
+    def added(code: str, j: int) -> float:
+        """把 j 放到 code 上，总节省增加多少。"""
+        members = holders.get(code, [])
+        return total(code, members + [j]) - total(code, members)
+
+    candidates: List[Tuple[float, int, str]] = []
+    for i, e in enumerate(entries):
+        for length, count in slots.items():
+            if count and length < len(e.code):
+                code = e.code[:length]
+                # 放在第一个空位时的节省：同码的全码排在前面
+                saving = e.freq * (len(e.code) - length - occupied.get(code, 0))
+                if saving > 0:
+                    candidates.append((saving, i, code))
+    candidates.sort(key=lambda c: (-c[0], c[1]))
+
+    assigned: Dict[int, str] = {}
+    holders: Dict[str, List[int]] = {}
+
+    def alternative(i: int, exclude: str) -> Tuple[Optional[str], float]:
+        """i 的其他简码中，仍有空位且节省最多的一个，及放上去的节省。"""
+        e = entries[i]
+        best: Optional[str] = None
+        best_gain = 0.0
+        for length, count in slots.items():
+            code = e.code[:length]
+            if count and length < len(e.code) and code != exclude and room(code) > 0:
+                gain = added(code, i)
+                if gain > best_gain:
+                    best, best_gain = code, gain
+        return best, best_gain
+
+    for _, i, code in candidates:
+        if i not in assigned and room(code) > 0 and added(code, i) > 0:
+            capacity[code] -= 1
+            holders.setdefault(code, []).append(i)
+            assigned[i] = code
+
+    # 腾挪：贪心后仍没分到简码的字，把它想要的码位上的某个字挪到那个字另一个有空位的简码。
+    # 码位都已分完，挪动只占用没人要的空位，总节省增加才挪，因此不会比贪心差
+    for _, i, code in (candidates if relocate else []):
+        members = holders.get(code)
+        if i in assigned or not members:
+            continue
+        before = total(code, members)
+        best: Optional[Tuple[float, int, str]] = None
+        for j in members:
+            alt, alt_gain = alternative(j, code)
+            if alt is None:
+                continue
+            gain = total(code, [m for m in members if m != j] + [i]) - before + alt_gain
+            if best is None or gain > best[0]:
+                best = (gain, j, alt)
+        if best is None or best[0] <= 0:
+            continue
+        _, weakest, alt = best
+        members.remove(weakest)
+        members.append(i)
+        assigned[i] = code
+        capacity[alt] -= 1
+        holders.setdefault(alt, []).append(weakest)
+        assigned[weakest] = alt
+
+    result: List[ShortCode] = []
+    for code in sorted(holders):
+        for j, rank, saving in layout(code, holders[code]):
+            e = entries[j]
+            result.append(ShortCode(e.char, code, rank, e.freq, saving))
+    return result
+
+
+def weighted_length(entries: Sequence[CodeEntry], short: Sequence[ShortCode]) -> Tuple[float, float]:
+    """(只用全码时, 用上简码后) 按字频加权的击键数；选重键计入。"""
+    total = sum(e.freq for e in entries)
+    if not total:
+        return 0.0, 0.0
+    before = sum(e.freq * len(e.code) for e in entries) / total
+    return before, before - sum(s.saving for s in short) / total
+
+
+def write_outputs(short: Sequence[ShortCode], out_dir: str) -> None:
+    def fmt(freq: float) -> str:
+        return str(int(freq)) if freq.is_integer() else repr(freq)
+
+    write_lines(os.path.join(out_dir, OUT_TXT), (f"{s.char}\t{s.code}\t{fmt(s.freq)}" for s in short))
+    records = [{"name": s.char, "key": s.code} for s in short]
+    with open(os.path.join(out_dir, OUT_JSON), "w", encoding="utf-8") as f:
+        json.dump(records, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def build_jianma(scheme_dir: str, slots: Optional[Dict[int, int]] = None) -> List[ShortCode]:
+    """构建步骤：由方案目录下的全码表生成 jianma.txt 与 jianma.json。"""
+    with phase("load"):
+        entries = list(iter_code_table(os.path.join(scheme_dir, NAME_FULLCODE)))
+    with phase("aggregate"):
+        short = allocate(entries, slots or DEFAULT_SLOTS)
+    with phase("serialize"):
+        write_outputs(short, scheme_dir)
+    return short
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="按字频分配简码")
+    parser.add_argument("scheme_dir", nargs="?", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--slots", default="1=1,2=1,3=1", help="各级简码每个码位的字数")
+    parser.add_argument("--output-dir", help="输出目录，默认为方案目录")
+    args = parser.parse_args(argv)
+    try:
+        slots = parse_slots(args.slots)
+    except ValueError as e:
+        parser.error(str(e))
+
+    entries = list(iter_code_table(os.path.join(args.scheme_dir, NAME_FULLCODE)))
+    short = allocate(entries, slots)
+    write_outputs(short, args.output_dir or args.scheme_dir)
+
+    before, after = weighted_length(entries, short)
+    for length in sorted(slots):
+        n = sum(1 for s in short if len(s.code) == length)
+        print(f"{length} 简 {n} 字")
+    print(f"加权码长 {before:.4f} -> {after:.4f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
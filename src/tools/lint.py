@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+拆分表、字根表与码表的一致性检查。
+
+每个文件只顺序读一遍，先建好字根、别名、码表的哈希索引，再逐行检查，报告带行号：
+
+- unknown-root      ll_div.real.txt / hao_div.txt 中的部件不在字根表中；
+- unmapped-alias    ll_div.txt 中花括号内的别名既不在 PUAtoalias.txt 中，也不是字根表里的字根名，
+                    convert_ll_div 会原样保留花括号（字根表里有同名字根的视为有意保留）；
+- duplicate-map     同一字根在字根表中出现在编码不同的多行，或同一别名在 PUAtoalias.txt 中对应多个字符；
+- missing-fullcode  拆分表中的字在 ll_fullcode.txt 中没有编码。
+
+同一字根在多行中缺失时只报告一次，附出现次数与前几处行号。
+有问题时退出码为 1，可用 --ignore 忽略某类检查，适合在提交前运行。
+
+用法：
+  python src/tools/lint.py [方案目录 ...] [--ignore 类别] [--limit 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from divparse import merge_braced, parse_div_line, tokenize_div_rhs
+from generate_zigen_hao import extract_components
+from root_convert import NAME_DIV, NAME_MAP, NAME_PUA, OUT_DIV, OUT_MAP, iter_lines
+
+PUBLIC_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public"))
+NAME_FULLCODE = "ll_fullcode.txt"
+NAME_HAO_DIV = "hao_div.txt"
+NAME_HAO_MAP = "hao_map.txt"
+
+CATEGORIES = ("unknown-root", "unmapped-alias", "duplicate-map", "missing-fullcode")
+
+
+class Issue(NamedTuple):
+    path: str
+    line: int
+    category: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.line}: [{self.category}] {self.message}"
+
+
+def numbered(path: str) -> Iterator[Tuple[int, str]]:
+    return enumerate(iter_lines(path), 1)
+
+
+def add_line(found: Dict[str, List[int]], key: str, lineno: int) -> None:
+    """记录 key 出现的行号；同一行出现多次只记一次。"""
+    lines = found.setdefault(key, [])
+    if not lines or lines[-1] != lineno:
+        lines.append(lineno)
+
+
+class Linter:
+    def __init__(self, scheme_dir: str, limit: int = 5) -> None:
+        self.scheme_dir = scheme_dir
+        self.limit = limit
+        self.issues: List[Issue] = []
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.scheme_dir, name)
+
+    def report(self, name: str, line: int, category: str, message: str) -> None:
+        self.issues.append(Issue(self.path(name), line, category, message))
+
+    def report_grouped(self, name: str, category: str, found: Dict[str, List[int]], what: str) -> None:
+        """同一对象出现多次时只报一条：首次行号 + 次数 + 前几处行号。"""
+        for key, lines in found.items():
+            more = f"，共 {len(lines)} 处：{', '.join(map(str, lines[: self.limit]))}" if len(lines) > 1 else ""
+            self.report(name, lines[0], category, f"{what} {key!r}{more}")
+
+    # ---- 索引 ----
+
+    def index_map(self, name: str, split_chars: bool = False) -> Dict[str, Tuple[int, str]]:
+        """字根 -> (行号, 编码)，顺带检查重复。split_chars 时一个字段中的每个字也算字根。"""
+        roots: Dict[str, Tuple[int, str]] = {}
+        duplicates: Dict[str, List[int]] = {}
+        for lineno, line in numbered(self.path(name)):
+            code, sep, rhs = line.partition("\t")
+            if not sep:
+                continue
+            seen_here: Set[str] = set()
+            for root in rhs.split():
+                if root in seen_here:
+                    continue
+                seen_here.add(root)
+                if root in roots:
+                    first_line, first_code = roots[root]
+                    # 编码相同的重复只是冗余，编码不同才会让取码结果取决于行序
+                    if first_code.lower() != code.lower():
+                        duplicates.setdefault(root, [first_line]).append(lineno)
+                else:
+                    roots[root] = (lineno, code)
+            if split_chars:
+                for root in rhs.split():
+                    for ch in root:
+                        roots.setdefault(ch, (lineno, code))
+        self.report_grouped(name, "duplicate-map", duplicates, "字根在多行中编码不同：")
+        return roots
+
+    def index_pua(self) -> Dict[str, str]:
+        aliases: Dict[str, str] = {}
+        first: Dict[str, int] = {}
+        duplicates: Dict[str, List[int]] = {}
+        for lineno, line in numbered(self.path(NAME_PUA)):
+            real, sep, alias = line.partition("\t")
+            real, alias = real.strip(), alias.strip()
+            if not sep or not real or not alias:
+                continue
+            if alias in aliases and aliases[alias] != real:
+                duplicates.setdefault(alias, [first[alias]]).append(lineno)
+            aliases[alias] = real
+            first.setdefault(alias, lineno)
+        self.report_grouped(NAME_PUA, "duplicate-map", duplicates, "别名对应多个字符：")
+        return aliases
+
+    def index_fullcode(self) -> Set[str]:
+        path = self.path(NAME_FULLCODE)
+        if not os.path.exists(path):
+            return set()
+        return {line.split("\t", 1)[0] for line in iter_lines(path) if line}
+
+    # ---- 检查 ----
+
+    def lint_ll(self) -> None:
+        aliases = self.index_pua()
+        roots = self.index_map(OUT_MAP)
+        # ll_map.txt 中写出的字根名（含未转换的多字名称）
+        names = {root for _, line in numbered(self.path(NAME_MAP)) for root in line.partition("\t")[2].split()}
+        fullcode = self.index_fullcode()
+
+        unmapped: Dict[str, List[int]] = {}
+        for lineno, line in numbered(self.path(NAME_DIV)):
+            _char, sep, rhs = line.partition("\t")
+            if not sep or "{" not in rhs:
+                continue
+            for token, braced in tokenize_div_rhs(rhs.strip()):
+                if braced and token not in aliases and token not in names and "{" + token + "}" not in roots:
+                    add_line(unmapped, token, lineno)
+        self.report_grouped(NAME_DIV, "unmapped-alias", unmapped, "别名未能转换：")
+
+        unknown: Dict[str, List[int]] = {}
+        for lineno, line in numbered(self.path(OUT_DIV)):
+            entry = parse_div_line(line.strip())
+            if entry is None:
+                continue
+            for comp in merge_braced(entry.components):
+                if comp not in roots and comp.strip("{}") not in roots:
+                    add_line(unknown, comp, lineno)
+            if fullcode and entry.char not in fullcode:
+                self.report(OUT_DIV, lineno, "missing-fullcode", f"{entry.char} 不在 {NAME_FULLCODE} 中")
+        self.report_grouped(OUT_DIV, "unknown-root", unknown, "字根表中没有部件")
+
+    def lint_hao(self) -> None:
+        roots = self.index_map(NAME_HAO_MAP, split_chars=True)
+        unknown: Dict[str, List[int]] = {}
+        for lineno, line in numbered(self.path(NAME_HAO_DIV)):
+            for comp in extract_components(line):
+                if comp not in roots:
+                    add_line(unknown, comp, lineno)
+        self.report_grouped(NAME_HAO_DIV, "unknown-root", unknown, "字根表中没有部件")
+
+    def run(self) -> List[Issue]:
+        if os.path.exists(self.path(NAME_HAO_DIV)):
+            self.lint_hao()
+        else:
+            self.lint_ll()
+        return self.issues
+
+
+def default_schemes() -> List[str]:
+    return sorted(
+        os.path.join(PUBLIC_DIR, d)
+        for d in os.listdir(PUBLIC_DIR)
+        if os.path.exists(os.path.join(PUBLIC_DIR, d, OUT_DIV))
+        or os.path.exists(os.path.join(PUBLIC_DIR, d, NAME_HAO_DIV))
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="拆分表、字根表与码表的一致性检查")
+    parser.add_argument("schemes", nargs="*", help="方案目录，默认检查 src/public 下的全部方案")
+    parser.add_argument("--ignore", action="append", default=[], help=f"忽略的类别：{', '.join(CATEGORIES)}")
+    parser.add_argument("--limit", type=int, default=5, help="合并报告时列出的行号个数")
+    args = parser.parse_args(argv)
+    unknown = [c for c in args.ignore if c not in CATEGORIES]
+    if unknown:
+        parser.error(f"未知类别：{', '.join(unknown)}")
+
+    total = 0
+    for scheme_dir in args.schemes or default_schemes():
+        issues = [i for i in Linter(scheme_dir, args.limit).run() if i.category not in args.ignore]
+        for issue in issues:
+            print(issue)
+        total += len(issues)
+    print(f"共 {total} 个问题", file=sys.stderr)
+    return 1 if total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
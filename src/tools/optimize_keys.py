@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+字根大码布局的模拟退火搜索。
+
+ll_map.txt / hao_map.txt 中的大码是手工调出来的，每试一种改动都要重新生成整张码表
+才能看到效果。本工具在“字根组 -> 大码”上做模拟退火，目标为
+
+  代价 = 前N动重（‱） + 当量权重 × 加权键均当量
+
+其中动重与当量的定义同 evaluate.py，只统计字频前 N 的字（默认 6000）。当量须由
+--pair-table 给出当量表，不给时代价只含动重。
+编码相同的字根视为一组（同一行或同码的多行，即已归并的字根），整组一起移动；
+小码保持不变，全码按 encode.py 的取码规则由字根编码推出。
+
+一步移动只改变一组的大码，受影响的只有用到这组大码的字。事先建好“组 -> 字”的
+倒排表，每步只重算这些字的编码与键对当量，并只重算它们离开和进入的几个同码桶，
+代价按差值更新，不必重算整张码表。
+
+移动不得使两组的字根编码相同（那等于把两组字根合并），这样的移动直接跳过；代价不变的
+移动也不接受。退火结束后再逐组试着移回原来的大码，代价不升高就移回，只留下有用的改动。
+即便如此，只要能降低代价的移动都会被接受，改动的组数并不少：liuli 上 2 万步即改动
+一百六十组以上（动重由 3.84‱ 降到 1.7‱ 左右）。只想在原布局上微调时，用 --max-changes
+限制与原布局不同的组数，并配合较低的初温：liuli 上 2 万步、--max-changes 10 --t-start 0.005
+改动 7 组，动重降到 2.70‱。
+
+多次重启（不同随机种子）分到进程池中并行执行，取代价最低的布局，按原字根表的格式
+写出（只替换编码的首字母，大小写保持原样），不改动原文件。
+
+用法：
+  python src/tools/optimize_keys.py [方案目录] [--steps N] [--restarts N] [--jobs N]
+                                    [--top 6000] [--equiv-weight W] [--pair-table 当量表]
+                                    [--t-start T] [--t-end T] [--max-changes K] [--seed S]
+                                    [--output 文件]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from divparse import load_div, merge_braced
+from encode import code_template
+from evaluate import DEFAULT_TOP, KEY_INDEX, KEYS, N_KEYS, load_pair_table
+from generate_zigen import DEFAULT_SCHEME_DIR, read_char_frequency, read_ll_map
+from generate_zigen_hao import extract_components, extract_weight, read_hao_map
+from root_convert import read_lines, write_lines
+
+DEFAULT_STEPS = 200_000
+DEFAULT_EQUIV_WEIGHT = 100.0
+# 默认初温与终温，单位同代价；指数降温。初温较低，过程接近逐步下降，
+# 但并不限制改动的组数（见 --max-changes）
+T_START = 0.5
+T_END = 0.005
+# 编码的整数表示：每码取 键下标 + 1，按 CODE_BASE 进位，不同长度的编码互不相同
+CODE_BASE = N_KEYS + 1
+# 代价变化小于此值视为不变
+EPS = 1e-9
+
+
+class Problem(NamedTuple):
+    """一次搜索所需的全部数据，会原样传给每个工作进程。"""
+
+    groups: List[str]  # 每组的原编码（小写）
+    keys: List[int]  # 可用的大码（KEYS 中的下标）
+    initial: List[int]  # 每组原来的大码
+    # 每字的取码：>= 0 为组号（取该组的大码），< 0 为固定的键 ~下标（小码）
+    slots: List[Tuple[int, ...]]
+    freqs: List[float]
+    users: List[List[int]]  # 组 -> 用到该组大码的字
+    # 与 users 对应：该组大码每变 1，这个字编码的整数表示变化多少
+    coefs: List[List[int]]
+    # 组 -> 涉及该组大码的键对 (字频, 前一码, 后一码)，码的记法同 slots
+    pairs: List[List[Tuple[float, int, int]]]
+    pair_table: List[float]
+    total_freq: float
+    pair_freq: float
+    equiv_weight: float
+
+
+class Outcome(NamedTuple):
+    seed: int
+    cost: float
+    assign: List[int]
+    moves: int
+    seconds: float
+
+
+def load_scheme(scheme_dir: str) -> Tuple[str, Dict[str, dict], List[Tuple[str, Tuple[str, ...], float]]]:
+    """读取字根表与拆分表，返回 (字根表文件名, 字根 -> 编码, [(字, 部件, 字频)])。"""
+    hao_div = os.path.join(scheme_dir, "hao_div.txt")
+    chars: List[Tuple[str, Tuple[str, ...], float]] = []
+    seen = set()
+    if os.path.exists(hao_div):
+        root_map = read_hao_map(os.path.join(scheme_dir, "hao_map.txt"))
+        with open(hao_div, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                char = line.split()[0]
+                if char not in seen:
+                    seen.add(char)
+                    chars.append((char, tuple(extract_components(line)), extract_weight(line)))
+        return "hao_map.txt", root_map, chars
+
+    root_map, _ = read_ll_map(os.path.join(scheme_dir, "ll_map.real.txt"))
+    freq = read_char_frequency(os.path.join(scheme_dir, "ll_fullcode.txt")) or {}
+    for entry in load_div(os.path.join(scheme_dir, "ll_div.real.txt")):
+        if entry.char not in seen:
+            seen.add(entry.char)
+            chars.append((entry.char, merge_braced(entry.components), freq.get(entry.char, 0.0)))
+    return "ll_map.txt", root_map, chars
+
+
+def build_problem(
+    root_map: Dict[str, dict],
+    chars: Sequence[Tuple[str, Tuple[str, ...], float]],
+    top: int = DEFAULT_TOP,
+    pair_table: Optional[List[float]] = None,
+    equiv_weight: float = DEFAULT_EQUIV_WEIGHT,
+) -> Problem:
+    if pair_table is None:
+        # 没有当量表时不计当量
+        pair_table = [0.0] * (N_KEYS * N_KEYS)
+        equiv_weight = 0.0
+
+    group_of: Dict[str, int] = {}
+    groups: List[str] = []
+    root_code: Dict[str, str] = {}
+    for root, entry in root_map.items():
+        code = entry["key"] + (entry["secondary"] or "")
+        if any(k not in KEY_INDEX for k in code):
+            continue
+        root_code[root] = code
+        if code not in group_of:
+            group_of[code] = len(groups)
+            groups.append(code)
+
+    # 只取全部部件都能编码的字，按字频从高到低取前 top 个
+    usable = [c for c in chars if c[1] and all(comp in root_code for comp in c[1])]
+    usable.sort(key=lambda c: -c[2])
+    usable = usable[:top]
+
+    slots: List[Tuple[int, ...]] = []
+    freqs: List[float] = []
+    users: List[List[int]] = [[] for _ in groups]
+    coefs: List[List[int]] = [[] for _ in groups]
+    pairs: List[List[Tuple[float, int, int]]] = [[] for _ in groups]
+    pair_freq: Dict[Tuple[int, int], float] = {}
+    for _char, comps, freq in usable:
+        codes = [root_code[comp] for comp in comps]
+        width = len(codes[0])
+        if any(len(code) != width for code in codes):
+            continue
+        index = len(slots)
+        char_slots = tuple(
+            group_of[codes[r]] if i == 0 else ~KEY_INDEX[codes[r][i]]
+            for r, i in code_template(len(codes), width)
+        )
+        slots.append(char_slots)
+        freqs.append(freq)
+
+        # 同一组在一个字里出现多次时合并为一项
+        coef: Dict[int, int] = {}
+        for pos, s in enumerate(char_slots):
+            if s >= 0:
+                coef[s] = coef.get(s, 0) + CODE_BASE ** (len(char_slots) - 1 - pos)
+        for g, value in coef.items():
+            users[g].append(index)
+            coefs[g].append(value)
+        for a, b in zip(char_slots, char_slots[1:]):
+            pair_freq[a, b] = pair_freq.get((a, b), 0.0) + freq
+
+    # 相同的键对合并，字频相加
+    for (a, b), freq in pair_freq.items():
+        for g in {a, b}:
+            if g >= 0:
+                pairs[g].append((freq, a, b))
+
+    initial = [KEY_INDEX[code[0]] for code in groups]
+    keys = sorted(set(initial))
+    return Problem(groups, keys, initial, slots, freqs, users, coefs, pairs, pair_table,
+                   sum(freqs), sum(pair_freq.values()), equiv_weight)
+
+
+class State:
+    """一种布局下各字的编码、同码桶与代价，支持按差值移动一组的大码。"""
+
+    def __init__(self, problem: Problem, assign: Sequence[int]) -> None:
+        self.problem = problem
+        self.assign = list(assign)
+        # (大码, 小码) -> 组：各组的字根编码须互不相同，否则等于把两组字根合并
+        self.owner: Dict[Tuple[int, str], int] = {}
+        # 大码与原布局不同的组数
+        self.changed = sum(a != b for a, b in zip(self.assign, problem.initial))
+        for g, key in enumerate(self.assign):
+            if self.owner.setdefault((key, problem.groups[g][1:]), g) != g:
+                raise ValueError(f"字根编码重复：{KEYS[key]}{problem.groups[g][1:]}")
+        self.codes: List[int] = []
+        self.buckets: Dict[int, List[int]] = {}
+        self.equiv_sum = 0.0
+        for c in range(len(problem.slots)):
+            code, equiv = self._encode(c)
+            self.codes.append(code)
+            self.equiv_sum += equiv
+            self.buckets.setdefault(code, []).append(c)
+        self.dup_freq = self._dup_sum(self.buckets)
+
+    def _encode(self, c: int) -> Tuple[int, float]:
+        """返回 (编码的整数表示, 字频 × 键对当量之和)。"""
+        assign = self.assign
+        table = self.problem.pair_table
+        code = 0
+        cost = 0.0
+        prev = -1
+        for s in self.problem.slots[c]:
+            k = assign[s] if s >= 0 else ~s
+            code = code * CODE_BASE + k + 1
+            if prev >= 0:
+                cost += table[prev * N_KEYS + k]
+            prev = k
+        return code, cost * self.problem.freqs[c]
+
+    def cost(self) -> float:
+        p = self.problem
+        dup = self.dup_freq / p.total_freq * 10000 if p.total_freq else 0.0
+        equiv = self.equiv_sum / p.pair_freq if p.pair_freq else 0.0
+        return dup + p.equiv_weight * equiv
+
+    def is_free(self, group: int, key: int) -> bool:
+        """把这组改到 key 上后，其字根编码是否未被别的组占用。"""
+        return self.owner.get((key, self.problem.groups[group][1:]), group) == group
+
+    def move(self, group: int, key: int) -> float:
+        """把一组改到 key 上，返回代价的变化量；目标编码已被别的组占用时抛出 ValueError。"""
+        p = self.problem
+        assign = self.assign
+        shift = key - assign[group]
+        if not shift:
+            return 0.0
+        if not self.is_free(group, key):
+            raise ValueError(f"字根编码 {KEYS[key]}{p.groups[group][1:]} 已被占用")
+        suffix = p.groups[group][1:]
+        del self.owner[assign[group], suffix]
+        self.owner[key, suffix] = group
+        initial = p.initial[group]
+        self.changed += (key != initial) - (assign[group] != initial)
+        before = self.cost()
+        affected = p.users[group]
+        codes = self.codes
+        buckets = self.buckets
+
+        moved = [(c, codes[c], codes[c] + shift * coef) for c, coef in zip(affected, p.coefs[group])]
+        touched = {old for _, old, _ in moved}
+        touched.update(new for _, _, new in moved)
+        dup_before = self._dup_sum(touched)
+        for c, old, new in moved:
+            members = buckets[old]
+            if len(members) == 1:
+                del buckets[old]
+            else:
+                members.remove(c)
+            codes[c] = new
+            members = buckets.get(new)
+            if members is None:
+                buckets[new] = [c]
+            else:
+                members.append(c)
+        dup_after = self._dup_sum(touched)
+
+        # 只有与这组大码相邻的键对当量会变
+        table = p.pair_table
+        pairs = p.pairs[group]
+        equiv_before = self._pair_sum(pairs, table)
+        assign[group] = key
+        equiv_after = self._pair_sum(pairs, table)
+
+        self.dup_freq += dup_after - dup_before
+        self.equiv_sum += equiv_after - equiv_before
+        return self.cost() - before
+
+    def _dup_sum(self, codes: Iterable[int]) -> float:
+        """若干同码桶的选重字频之和；多数桶只有一个字，直接跳过。"""
+        freqs = self.problem.freqs
+        total = 0.0
+        for members in map(self.buckets.get, codes):
+            if members is not None and len(members) > 1:
+                values = [freqs[c] for c in members]
+                total += sum(values) - max(values)
+        return total
+
+    def _pair_sum(self, pairs: List[Tuple[float, int, int]], table: List[float]) -> float:
+        assign = self.assign
+        return sum(
+            freq * table[(assign[a] if a >= 0 else ~a) * N_KEYS + (assign[b] if b >= 0 else ~b)]
+            for freq, a, b in pairs
+        )
+
+
+def anneal(
+    problem: Problem,
+    seed: int,
+    steps: int,
+    t_start: float = T_START,
+    t_end: float = T_END,
+    max_changes: Optional[int] = None,
+) -> Outcome:
+    """从原布局出发做一次模拟退火，返回途中代价最低的布局（已经 prune 去掉无用的改动）。
+    给出 max_changes 时，与原布局不同的组数不超过该值。"""
+    rng = random.Random(seed)
+    state = State(problem, problem.initial)
+    cost = state.cost()
+    best_cost = cost
+    best_assign = list(state.assign)
+    movable = [g for g, u in enumerate(problem.users) if u]
+    keys = problem.keys
+    if not movable or len(keys) < 2 or steps <= 0:
+        return Outcome(seed, cost, best_assign, 0, 0.0)
+
+    start = time.perf_counter()
+    cooling = (t_end / t_start) ** (1 / steps)
+    temperature = t_start / cooling
+    for _step in range(steps):
+        temperature *= cooling
+        group = rng.choice(movable)
+        old_key = state.assign[group]
+        key = rng.choice(keys)
+        # 不许移到别的组已占用的编码上
+        if key == old_key or not state.is_free(group, key):
+            continue
+        if (max_changes is not None and old_key == problem.initial[group]
+                and state.changed >= max_changes):
+            continue
+        delta = state.move(group, key)
+        # 代价不变的移动也不接受，否则只被生僻字用到的组会随机漂移
+        if delta < -EPS or (delta > EPS and rng.random() < math.exp(-delta / temperature)):
+            cost += delta
+            if cost < best_cost - EPS:
+                best_cost = cost
+                best_assign = list(state.assign)
+        else:
+            state.move(group, old_key)
+    best = prune(problem, best_assign)
+    return Outcome(seed, best.cost(), best.assign, steps, time.perf_counter() - start)
+
+
+def prune(problem: Problem, assign: Sequence[int]) -> State:
+    """逐个把改动过的组移回原来的大码，代价不升高就保留移回，只留下确实有用的改动。
+    移回一组可能让别的组也变得可以移回，所以反复进行到没有可移回的组为止。"""
+    state = State(problem, assign)
+    reverted = True
+    while reverted:
+        reverted = False
+        for group, key in enumerate(problem.initial):
+            old_key = state.assign[group]
+            if old_key == key or not state.is_free(group, key):
+                continue
+            if state.move(group, key) > EPS:
+                state.move(group, old_key)
+            else:
+                reverted = True
+    return state
+
+
+_PROBLEM: Optional[Problem] = None
+
+
+def _init_worker(problem: Problem) -> None:
+    global _PROBLEM
+    _PROBLEM = problem
+
+
+def _run_restart(args: Tuple[int, int, float, float, Optional[int]]) -> Outcome:
+    assert _PROBLEM is not None
+    return anneal(_PROBLEM, *args)
+
+
+def optimize(
+    problem: Problem,
+    restarts: int,
+    steps: int,
+    seed: int = 0,
+    jobs: int = 1,
+    t_start: float = T_START,
+    t_end: float = T_END,
+    max_changes: Optional[int] = None,
+) -> List[Outcome]:
+    """执行 restarts 次退火，按代价从低到高返回结果；jobs > 1 时分到进程池中。"""
+    tasks = [(seed + i, steps, t_start, t_end, max_changes) for i in range(restarts)]
+    if jobs <= 1 or restarts <= 1:
+        outcomes = [anneal(problem, *t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(problem,)) as pool:
+            outcomes = list(pool.map(_run_restart, tasks))
+    return sorted(outcomes, key=lambda o: o.cost)
+
+
+def rewrite_map(lines: Sequence[str], problem: Problem, assign: Sequence[int]) -> List[str]:
+    """按新布局改写字根表各行编码的首字母，大小写与原来一致。"""
+    new_key = {code: KEYS[k] for code, k in zip(problem.groups, assign)}
+    out: List[str] = []
+    for line in lines:
+        code, sep, rest = line.partition("\t")
+        key = new_key.get(code.lower())
+        if sep and key is not None:
+            first = key.upper() if code[0].isupper() else key
+            line = first + code[1:] + sep + rest
+        out.append(line)
+    return out
+
+
+def describe(state: State) -> str:
+    p = state.problem
+    dups = sum(len(m) - 1 for m in state.buckets.values())
+    dup_rate = state.dup_freq / p.total_freq * 10000 if p.total_freq else 0.0
+    equiv = f"{state.equiv_sum / p.pair_freq:.4f}" if p.pair_freq and p.equiv_weight else "-"
+    return f"选重 {dups}  动重 {dup_rate:.2f}‱  当量 {equiv}  代价 {state.cost():.4f}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="字根大码布局的模拟退火搜索")
+    parser.add_argument("scheme_dir", nargs="?", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="每次退火的移动步数")
+    parser.add_argument("--restarts", type=int, default=4, help="重启次数")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="并行进程数")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="只统计字频前 N 的字")
+    parser.add_argument("--equiv-weight", type=float, default=DEFAULT_EQUIV_WEIGHT,
+                        help="加权键均当量在代价中的权重（动重以‱计）")
+    parser.add_argument("--pair-table", help="键对当量表（键对\\t当量）")
+    parser.add_argument("--t-start", type=float, default=T_START, help="初温")
+    parser.add_argument("--t-end", type=float, default=T_END, help="终温")
+    parser.add_argument("--max-changes", type=int, metavar="K", help="与原布局不同的组数上限，默认不限")
+    parser.add_argument("--seed", type=int, default=0, help="首次重启的随机种子")
+    parser.add_argument("--output", help="输出文件，默认为方案目录下的 *_map.opt.txt")
+    args = parser.parse_args(argv)
+
+    map_name, root_map, chars = load_scheme(args.scheme_dir)
+    try:
+        pair_table = load_pair_table(args.pair_table) if args.pair_table else None
+    except ValueError as e:
+        parser.error(str(e))
+    problem = build_problem(root_map, chars, args.top, pair_table, args.equiv_weight)
+    print(f"{len(problem.groups)} 组字根，{len(problem.slots)} 字，可用大码 "
+          f"{''.join(KEYS[k] for k in problem.keys)}")
+    print(f"原布局：{describe(State(problem, problem.initial))}")
+
+    outcomes = optimize(problem, args.restarts, args.steps, args.seed, args.jobs, args.t_start, args.t_end,
+                        args.max_changes)
+    for o in outcomes:
+        rate = o.moves / o.seconds if o.seconds else 0.0
+        print(f"  种子 {o.seed}：代价 {o.cost:.4f}（{rate:,.0f} 步/秒）")
+    best = outcomes[0]
+    state = State(problem, best.assign)
+    print(f"最优布局：{describe(state)}")
+
+    moved = [(problem.groups[g], KEYS[k]) for g, k in enumerate(best.assign) if k != problem.initial[g]]
+    print(f"改动 {len(moved)} 组：" + " ".join(f"{code}->{key}{code[1:]}" for code, key in moved))
+
+    src = os.path.join(args.scheme_dir, map_name)
+    output = args.output or os.path.splitext(src)[0] + ".opt.txt"
+    write_lines(output, rewrite_map(read_lines(src), problem, best.assign))
+    print(f"已写入 {output}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+把方案码表导出为 Rime 词典（*.dict.yaml）。
+
+- <方案名>.dict.yaml：由 ll_fullcode.txt 逐行导出“字\t编码\t权重”，权重取字频列；
+- <方案名>_chaifen.dict.yaml：拆分反查词典，由 ll_div.real.txt（hao 方案为 hao_div.txt）
+  导出“字\t拆分”。拆分写在编码列，不是按键序列，不能用来打字，只供反查：
+  reverse_lookup_filter 查到候选字在这部词典里的“编码”，即拆分，显示为候选注释。
+  拆分的写法与 chaifen.json 的 comp 相同：多字的字根名用花括号括起，如 `木禾丂{戈无一}`。
+  hao_div.txt 的末列权重一并写出，整数权重不带小数。
+- <方案名>_chaifen.schema.yaml：只引用上面词典的配套方案。Rime 只编译方案里用到的词典，
+  主方案把它列为依赖，部署时才会生成反查所需的文件；它本身不必加进方案列表。
+- <方案名>_chaifen.patch.yaml：挂上拆分注释的补丁，把其中 patch 下的各项并入
+  <方案名>.custom.yaml（方案名即主方案的 schema_id），重新部署后候选注释即显示拆分：
+    patch:
+      schema/dependencies/+: [<方案名>_chaifen]
+      engine/filters/+: [reverse_lookup_filter@chaifen_lookup]
+      chaifen_lookup: {dictionary: <方案名>_chaifen, overwrite_comment: true}
+
+hao 方案仓库里没有全码表，只导出拆分反查词典。
+
+输入逐行读取、输出逐行写出（先写临时文件再替换），不在内存中保留整张表。
+
+用法：
+  python src/tools/rime.py [方案目录] [--name 方案名] [--output-dir 目录] [--version 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Iterable, Iterator, List, Optional
+
+from divparse import parse_div_line
+from generate_zigen import DEFAULT_SCHEME_DIR
+from generate_zigen_hao import extract_components, extract_weight
+from root_convert import iter_lines, write_lines
+
+NAME_FULLCODE = "ll_fullcode.txt"
+NAME_DIV = "ll_div.real.txt"
+NAME_HAO_DIV = "hao_div.txt"
+
+
+def generated_note(kind: str) -> List[str]:
+    return [f"# Rime {kind}", "# encoding: utf-8", "#", "# 由 src/tools/rime.py 生成，请勿手动修改"]
+
+
+def dict_header(name: str, version: str) -> List[str]:
+    return generated_note("dictionary") + [
+        "",
+        "---",
+        f"name: {name}",
+        f'version: "{version}"',
+        "sort: by_weight",
+        "use_preset_vocabulary: false",
+        "...",
+        "",
+    ]
+
+
+def chaifen_schema(name: str, version: str) -> List[str]:
+    """只引用拆分词典的配套方案，让部署时编译它。"""
+    return generated_note("schema") + [
+        f"# 供 {name} 反查拆分，不必加进方案列表",
+        "",
+        "schema:",
+        f"  schema_id: {name}_chaifen",
+        f"  name: {name} 拆分",
+        f'  version: "{version}"',
+        "engine:",
+        "  translators:",
+        "    - table_translator",
+        "translator:",
+        f"  dictionary: {name}_chaifen",
+    ]
+
+
+def chaifen_patch(name: str) -> List[str]:
+    """并入 <name>.custom.yaml 的补丁：候选注释显示拆分。"""
+    return generated_note("patch") + [
+        f"# 把 patch 下的各项并入 {name}.custom.yaml 后重新部署",
+        "",
+        "patch:",
+        "  schema/dependencies/+:",
+        f"    - {name}_chaifen",
+        "  engine/filters/+:",
+        "    - reverse_lookup_filter@chaifen_lookup",
+        "  chaifen_lookup:",
+        f"    dictionary: {name}_chaifen",
+        "    overwrite_comment: true",
+    ]
+
+
+def iter_fullcode_entries(lines: Iterable[str]) -> Iterator[str]:
+    """ll_fullcode.txt -> 字\t编码\t权重"""
+    for line in lines:
+        parts = line.split("\t")
+        if len(parts) < 2 or not parts[0] or not parts[1]:
+            continue
+        weight = parts[2].strip() if len(parts) > 2 and parts[2].strip() else "0"
+        yield f"{parts[0]}\t{parts[1]}\t{weight}"
+
+
+def join_components(components: Iterable[str]) -> str:
+    """按构形串的写法拼接部件，多字的字根名加花括号。"""
+    return "".join(c if len(c) == 1 else f"{{{c}}}" for c in components)
+
+
+def format_weight(weight: float) -> str:
+    return str(int(weight)) if weight.is_integer() else f"{weight:.10f}"
+
+
+def iter_div_entries(lines: Iterable[str]) -> Iterator[str]:
+    """ll_div.real.txt -> 字\t拆分"""
+    for line in lines:
+        entry = parse_div_line(line.strip())
+        if entry is not None and entry.components:
+            # 制表符格式直接沿用构形串（与 chaifen.json 相同），旧的方括号格式按部件拼接
+            comp = entry.rhs.strip() if entry.rhs is not None else join_components(entry.components)
+            yield f"{entry.char}\t{comp}"
+
+
+def iter_hao_div_entries(lines: Iterable[str]) -> Iterator[str]:
+    """hao_div.txt -> 字\t拆分\t权重"""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        components = extract_components(line)
+        if components:
+            # extract_components 逐字切分，花括号也在其中，拼回即原来的拆分串
+            yield f"{line.split()[0]}\t{''.join(components)}\t{format_weight(extract_weight(line))}"
+
+
+def write_dict(path: str, name: str, version: str, entries: Iterable[str]) -> None:
+    def lines() -> Iterator[str]:
+        yield from dict_header(name, version)
+        yield from entries
+
+    write_lines(path, lines())
+
+
+def export_scheme(scheme_dir: str, name: str, output_dir: str, version: str = "1.0") -> List[str]:
+    """导出方案目录下能导出的词典（有拆分表时连同配套方案与补丁），返回写出的文件。"""
+    os.makedirs(output_dir, exist_ok=True)
+    written: List[str] = []
+
+    def emit(dict_name: str, entries: Iterable[str]) -> None:
+        path = os.path.join(output_dir, f"{dict_name}.dict.yaml")
+        write_dict(path, dict_name, version, entries)
+        written.append(path)
+
+    fullcode = os.path.join(scheme_dir, NAME_FULLCODE)
+    if os.path.exists(fullcode):
+        emit(name, iter_fullcode_entries(iter_lines(fullcode)))
+    div = os.path.join(scheme_dir, NAME_DIV)
+    hao_div = os.path.join(scheme_dir, NAME_HAO_DIV)
+    if os.path.exists(div):
+        emit(f"{name}_chaifen", iter_div_entries(iter_lines(div)))
+    elif os.path.exists(hao_div):
+        emit(f"{name}_chaifen", iter_hao_div_entries(iter_lines(hao_div)))
+    else:
+        return written
+    for file_name, lines in (
+        (f"{name}_chaifen.schema.yaml", chaifen_schema(name, version)),
+        (f"{name}_chaifen.patch.yaml", chaifen_patch(name)),
+    ):
+        path = os.path.join(output_dir, file_name)
+        write_lines(path, lines)
+        written.append(path)
+    return written
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="导出 Rime 词典")
+    parser.add_argument("scheme_dir", nargs="?", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--name", help="词典名，默认为方案目录名")
+    parser.add_argument("--output-dir", help="输出目录，默认为方案目录")
+    parser.add_argument("--version", default="1.0", help="词典版本号")
+    args = parser.parse_args(argv)
+
+    name = args.name or os.path.basename(os.path.normpath(args.scheme_dir))
+    written = export_scheme(args.scheme_dir, name, args.output_dir or args.scheme_dir, args.version)
+    if not written:
+        parser.error(f"{args.scheme_dir} 中没有可导出的码表或拆分表")
+    for path in written:
+        print(f"已写入 {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
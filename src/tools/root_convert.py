@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+将 `ll_div.txt` 和 `ll_map.txt` 中的复杂字根（含别名）根据 `PUAtoalias.txt`
+转换为对应的 PUA 简单字根字符。
+
+输出：
+- 生成同目录下的 `ll_div.real.txt` 与 `ll_map.real.txt`，不改动原始文件。
+
+规则概述：
+1) 从 `PUAtoalias.txt` 构建“别名（文本） -> PUA字符”的映射。
+
+2) 转换 `ll_div.txt`：
+   - 每行形如：字\t构形串
+   - 构形串中：
+       a. 花括号包裹的多字别名：如 `{在字框}` 作为整体处理
+       b. 其他为单字逐字处理
+   - 处理顺序：
+       i. 若 token 命中 PUA 表（别名→PUA），替换为对应的 PUA 字符
+       ii. 若无法映射，保持原样（含花括号）
+   - 输出时：成功映射者不再保留花括号；未映射者保留原样。
+
+3) 转换 `ll_map.txt`：
+   - 将该行右侧所有别名用 PUA 表替换为对应 PUA 字符；未命中则保留原文。
+   - 去重后按出现顺序保留。
+
+用法：
+  python src/tools/root_convert.py [方案目录] [--jobs N] [--match-unbraced]
+  方案目录默认为 `src/public/liuli`，结果写在该目录下。
+  `--jobs N` 将 ll_div.txt 按行切块，交给 N 个进程并行转换，输出与单进程完全一致。
+  `--match-unbraced` 额外识别直接嵌在文本中（没有花括号）的多字别名，
+  按最左最长规则替换（见 aliasmatch.py）；ll_map.txt 中整体查不到的别名也按此规则替换。
+
+ll_div.txt 按“读一行 -> 转换 -> 写一行”的方式流式处理（并行时同时在途的块数有上限），
+内存占用与拆分表大小无关。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+from aliasmatch import AliasMatcher
+from divparse import BRACED_RE
+from profiling import phase
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SCHEME_DIR = os.path.join(THIS_DIR, "..", "public", "liuli")
+
+NAME_PUA = "PUAtoalias.txt"
+NAME_MAP = "ll_map.txt"
+NAME_DIV = "ll_div.txt"
+
+OUT_MAP = "ll_map.real.txt"
+OUT_DIV = "ll_div.real.txt"
+
+# 并行转换时每块的行数
+CHUNK_LINES = 8192
+
+
+def read_lines(path: str) -> List[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f]
+
+
+def iter_lines(path: str) -> Iterator[str]:
+    """逐行读取，不把整份文件载入内存。"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def write_lines(path: str, lines: Iterable[str]) -> None:
+    """逐行写出；先写临时文件再替换，中途出错不会留下半截输出。"""
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def build_pua_to_alias(pua_lines: List[str]) -> Dict[str, str]:
+    """根据用户说明：第一列为简单字根，第二列为复杂字根/别名。
+    构建映射：复杂(别名) -> 简单。
+    """
+    mapping: Dict[str, str] = {}
+    for line in pua_lines:
+        if not line or "\t" not in line:
+            continue
+        real, complex_alias = line.split("\t", 1)
+        real = real.strip()
+        complex_alias = complex_alias.strip()
+        if real and complex_alias:
+            mapping[complex_alias] = real
+    return mapping
+
+
+# 取消从 ll_map.txt 推导“规范形”的逻辑，需求仅基于 PUA 映射
+
+
+def map_one_token(token: str, is_braced: bool, pua_to_alias: Dict[str, str]) -> str:
+    original = token
+    # 先用 PUA 别名表进行“别名 -> PUA”的替换（无论是否花括号）
+    if token in pua_to_alias:
+        token = pua_to_alias[token]
+        # 命中映射：直接返回替换结果（不保留花括号）
+        return token
+
+    # 未命中映射：
+    #    - 若是 braced，保留原样（含花括号），以免信息丢失；
+    #    - 若不是 braced，返回原字。
+    if is_braced:
+        return "{" + original + "}"
+    return original
+
+
+def build_translate_table(pua_to_alias: Dict[str, str]) -> Dict[int, str]:
+    """单字别名的 str.translate 表，用于一次性替换花括号之外的文本。"""
+    return {ord(k): v for k, v in pua_to_alias.items() if len(k) == 1}
+
+
+def convert_div_rhs(
+    rhs: str,
+    pua_to_alias: Dict[str, str],
+    table: Dict[int, str],
+    matcher: Optional[AliasMatcher] = None,
+) -> str:
+    """转换一条构形串，结果与逐 token 调用 `map_one_token` 相同。
+    给出 matcher 时，花括号之外的文本改用自动机替换，可识别其中的多字别名。
+    """
+    if "{" not in rhs:
+        return matcher.replace(rhs) if matcher else rhs.translate(table)
+    # 偶数位为花括号外的文本，奇数位为花括号内的别名
+    parts = BRACED_RE.split(rhs)
+    for i in range(0, len(parts), 2):
+        parts[i] = matcher.replace(parts[i]) if matcher else parts[i].translate(table)
+    for i in range(1, len(parts), 2):
+        inner = parts[i]
+        parts[i] = pua_to_alias.get(inner) or "{" + inner + "}"
+    return "".join(parts)
+
+
+def iter_convert_ll_div(
+    div_lines: Iterable[str],
+    pua_to_alias: Dict[str, str],
+    table: Optional[Dict[int, str]] = None,
+    matcher: Optional[AliasMatcher] = None,
+) -> Iterator[str]:
+    if table is None:
+        table = build_translate_table(pua_to_alias)
+    for line in div_lines:
+        if not line or "\t" not in line:
+            yield line
+            continue
+        left, rhs = line.split("\t", 1)
+        yield f"{left}\t{convert_div_rhs(rhs, pua_to_alias, table, matcher)}"
+
+
+def convert_ll_div(
+    div_lines: Iterable[str],
+    pua_to_alias: Dict[str, str],
+    table: Optional[Dict[int, str]] = None,
+    matcher: Optional[AliasMatcher] = None,
+) -> List[str]:
+    return list(iter_convert_ll_div(div_lines, pua_to_alias, table, matcher))
+
+
+# 并行转换时每个工作进程持有的映射，由 _init_worker 在进程启动时设置一次
+_worker_mapping: Dict[str, str] = {}
+_worker_table: Dict[int, str] = {}
+_worker_matcher: Optional[AliasMatcher] = None
+
+
+def _init_worker(pua_to_alias: Dict[str, str], match_unbraced: bool) -> None:
+    global _worker_mapping, _worker_table, _worker_matcher
+    _worker_mapping = pua_to_alias
+    _worker_table = build_translate_table(pua_to_alias)
+    _worker_matcher = AliasMatcher(pua_to_alias) if match_unbraced else None
+
+
+def _convert_chunk(lines: List[str]) -> List[str]:
+    return convert_ll_div(lines, _worker_mapping, _worker_table, _worker_matcher)
+
+
+def iter_chunks(lines: Iterable[str], size: int) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_convert_ll_div_parallel(
+    div_lines: Iterable[str],
+    pua_to_alias: Dict[str, str],
+    jobs: int,
+    chunk_lines: int = CHUNK_LINES,
+    match_unbraced: bool = False,
+) -> Iterator[str]:
+    """按行切块后多进程转换，按原顺序逐行产出，结果与 `convert_ll_div` 一致。
+    同时在途的块不超过 2 * jobs 个，内存占用有上限。
+    """
+    if jobs <= 1:
+        matcher = AliasMatcher(pua_to_alias) if match_unbraced else None
+        yield from iter_convert_ll_div(div_lines, pua_to_alias, matcher=matcher)
+        return
+
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(pua_to_alias, match_unbraced)
+    ) as pool:
+        for chunk in iter_chunks(div_lines, chunk_lines):
+            pending.append(pool.submit(_convert_chunk, chunk))
+            if len(pending) >= 2 * jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def convert_ll_div_parallel(
+    div_lines: Iterable[str], pua_to_alias: Dict[str, str], jobs: int
+) -> List[str]:
+    return list(iter_convert_ll_div_parallel(div_lines, pua_to_alias, jobs))
+
+
+def convert_ll_map(
+    map_lines: List[str],
+    pua_to_alias: Dict[str, str],
+    matcher: Optional[AliasMatcher] = None,
+) -> List[str]:
+    out: List[str] = []
+    for line in map_lines:
+        if not line or "\t" not in line:
+            out.append(line)
+            continue
+        code, rhs = line.split("\t", 1)
+        aliases = [t for t in rhs.strip().split(" ") if t]
+        simplified: List[str] = []
+        for alias in aliases:
+            a = pua_to_alias.get(alias)
+            if a is None:
+                a = matcher.replace(alias) if matcher else alias
+            simplified.append(a)
+
+        # 去重但保持相对顺序，且尽量只保留一个规范形
+        seen = set()
+        uniq: List[str] = []
+        for x in simplified:
+            if x not in seen:
+                seen.add(x)
+                uniq.append(x)
+
+        # 若存在多个，确保第一个是最终规范形（即 uniq[0]）
+        out.append(f"{code}\t{' '.join(uniq)}")
+    return out
+
+
+def load_pua_to_alias(scheme_dir: str) -> Dict[str, str]:
+    return build_pua_to_alias(read_lines(os.path.join(scheme_dir, NAME_PUA)))
+
+
+def convert_div_file(scheme_dir: str, jobs: int = 1, match_unbraced: bool = False) -> None:
+    """ll_div.txt -> ll_div.real.txt"""
+    with phase("load"):
+        pua_to_alias = load_pua_to_alias(scheme_dir)
+    div_lines = iter_lines(os.path.join(scheme_dir, NAME_DIV))
+    new_div = iter_convert_ll_div_parallel(
+        div_lines, pua_to_alias, jobs, match_unbraced=match_unbraced
+    )
+    # 逐行读入、转换、写出，三者交错进行，合计为 map
+    with phase("map"):
+        write_lines(os.path.join(scheme_dir, OUT_DIV), new_div)
+
+
+def convert_map_file(scheme_dir: str, match_unbraced: bool = False) -> None:
+    """ll_map.txt -> ll_map.real.txt"""
+    with phase("load"):
+        pua_to_alias = load_pua_to_alias(scheme_dir)
+        matcher = AliasMatcher(pua_to_alias) if match_unbraced else None
+        map_lines = read_lines(os.path.join(scheme_dir, NAME_MAP))
+    with phase("map"):
+        new_map = convert_ll_map(map_lines, pua_to_alias, matcher)
+    with phase("serialize"):
+        write_lines(os.path.join(scheme_dir, OUT_MAP), new_map)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="将别名字根转换为 PUA 字根")
+    parser.add_argument("scheme_dir", nargs="?", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="转换 ll_div.txt 的进程数")
+    parser.add_argument("--match-unbraced", action="store_true",
+                        help="识别没有花括号包裹、直接嵌在文本中的多字别名")
+    args = parser.parse_args()
+
+    convert_div_file(args.scheme_dir, jobs=args.jobs, match_unbraced=args.match_unbraced)
+    convert_map_file(args.scheme_dir, match_unbraced=args.match_unbraced)
+
+    print("完成：已生成 ll_div.real.txt 与 ll_map.real.txt")
+
+
+if __name__ == "__main__":
+    main()
+
+
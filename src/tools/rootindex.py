@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+字根倒排表：字根 -> 含该字根的字，按字频从高到低排列，用作字根表中的例字。
+
+每个字根只保留字频最高的 k 个字：边读拆分表边放入容量为 k 的小顶堆，不保留整张表。
+字频相同时先出现的字优先。
+
+ll_map 中同一编码的多个字根写在一行，归并字根表（zigen.json）把这一行当作一个组合字根。
+组合字根的例字取其中各字根倒排表的并集里字频最高的 k 个。并集的前 k 名必定也是
+它所在字根的前 k 名，所以每个字根只保留 k 个并不影响合并的结果。
+
+generate_zigen.py、generate_zigen_guibing.py 共用同一份倒排表，generate_zigen_hao.py
+也用这里的小顶堆取例字。
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Iterable, List, Tuple
+
+# 每个字根的例字个数
+EXAMPLES_PER_ZIGEN = 10
+
+# (字频, -出现次序, 字)：元组从大到小即按字频降序、同字频时按出现先后
+Posting = Tuple[float, int, str]
+
+
+def push_example(heap: List[Posting], weight: float, order: int, char: str, k: int = EXAMPLES_PER_ZIGEN) -> None:
+    """把例字放入容量为k的小顶堆，堆中始终是字频最高的k个字
+    字频相同时先出现的字优先（order为出现次序）"""
+    item = (weight, -order, char)
+    if len(heap) < k:
+        heapq.heappush(heap, item)
+    elif item > heap[0]:
+        heapq.heapreplace(heap, item)
+
+
+def heap_to_examples(heap: Iterable[Posting]) -> str:
+    """按字频从高到低排列堆中的例字"""
+    return "".join(char for _w, _o, char in sorted(heap, reverse=True))
+
+
+class RootIndex:
+    """字根 -> 字频最高的 k 个字，附带各字根在拆分表中的使用次数。"""
+
+    def __init__(self, k: int = EXAMPLES_PER_ZIGEN) -> None:
+        self.k = k
+        self._heaps: Dict[str, List[Posting]] = {}
+        self.frequency: Dict[str, int] = {}
+
+    def add(self, order: int, char: str, weight: float, components: Iterable[str]) -> None:
+        """登记拆分表中的一个字；空部件忽略，同一字里重复的部件只算一次例字。"""
+        components = [c for c in components if c]
+        for component in components:
+            self.frequency[component] = self.frequency.get(component, 0) + 1
+        for component in dict.fromkeys(components):
+            heap = self._heaps.get(component)
+            if heap is None:
+                heap = self._heaps[component] = []
+            push_example(heap, weight, order, char, self.k)
+
+    def __len__(self) -> int:
+        return len(self._heaps)
+
+    def __contains__(self, root: object) -> bool:
+        return root in self._heaps
+
+    def roots(self) -> List[str]:
+        """按首次出现的顺序列出字根。"""
+        return list(self._heaps)
+
+    def postings(self, root: str) -> List[Posting]:
+        return sorted(self._heaps.get(root, ()), reverse=True)
+
+    def examples(self, roots: Iterable[str]) -> str:
+        """一个或一组字根的例字：各字根倒排表的并集中字频最高的 k 个字。"""
+        merged: Dict[str, Posting] = {}
+        for root in roots:
+            for item in self._heaps.get(root, ()):
+                merged[item[2]] = item
+        return "".join(char for _w, _o, char in heapq.nlargest(self.k, merged.values()))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+在构建时把拼音、笔画、四角号码检索数据与拆分记录合并成一个文件，供搜索页一次下载。
+
+src/public/data/ 下的 pinyin.json、bihua.json、sijiao.json 都是“检索码 -> 一串汉字”，
+搜索组件原先要分别下载，再与 chaifen.json 建的 Map 逐字对照。这里把三者与
+chaifen.build_chaifen_records 的记录合并，写出方案目录下的 search.json：
+
+  {"version": 1,
+   "cards": [{"name", "comp", "key"}, ...],       # 与 chaifen.json 的记录相同
+   "pinyin": {"a": [行号, ...], ...},             # 行号为 cards 的下标，按原数据中的字序
+   "bihua": {...}, "sijiao": {...}}
+
+- 没有拆分记录的字不进索引（与 textToCardsProps 的过滤一致），没有任何字的检索码不写出；
+- sijiao 在构建时就做 prehandleJson 的处理：多于 4 码的号码同时并入其前 4 码。
+
+加 --interned 时另写 search.interned.json，把 cards 中的字符串收进一张去重的字符串表：
+
+  {"version": 1, "strings": [...], "cards": [名, 拆分, 编码, 名, 拆分, 编码, ...], ...}
+
+cards 为字符串表下标的扁平数组，每三个一条；索引部分与 search.json 相同。
+搜索组件目前仍分别下载 chaifen.json 与各检索数据，尚未改用这两个文件，因此 build.py
+默认不运行这一步，要加 --with search_index。
+
+用法：
+  python src/tools/search_index.py [方案目录] [--data-dir 目录] [--interned]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Optional
+
+from chaifen import build_chaifen_records
+from generate_zigen import DEFAULT_SCHEME_DIR
+from profiling import phase
+
+DATA_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "data"))
+KINDS = ("pinyin", "bihua", "sijiao")
+OUT_INDEX = "search.json"
+OUT_INTERNED = "search.interned.json"
+VERSION = 1
+SIJIAO_PREFIX = 4
+
+Records = List[Dict[str, str]]
+KeyIndex = Dict[str, List[int]]
+
+
+def load_lookup(path: str) -> Dict[str, str]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def is_array_index(key: str) -> bool:
+    """JS 对象中按数值排序的“数组下标”键：不带前导零的十进制整数，且小于 2**32 - 1。"""
+    return key.isdigit() and key.isascii() and (key == "0" or key[0] != "0") and int(key) < 2**32 - 1
+
+
+def js_key_order(obj: Dict[str, str]) -> List[str]:
+    """Object.entries 的遍历顺序：数组下标键按数值升序在前，其余键按插入（JSON 源文件中的）顺序。"""
+    return sorted((k for k in obj if is_array_index(k)), key=int) + [k for k in obj if not is_array_index(k)]
+
+
+def merge_sijiao_prefix(lookup: Dict[str, str]) -> Dict[str, str]:
+    """逐条照搬 share.ts 的 prehandleJson：多于 4 码的号码同时并入前 4 码。
+
+    按 Object.entries 的顺序遍历，前 4 码下的字序与网页端一致；像 `00227` 这样有前导零的键
+    不是数组下标，保持源文件中的顺序。后出现的 4 码键会覆盖此前并入的内容，与网页端相同。
+    """
+    result: Dict[str, str] = {}
+    for code in js_key_order(lookup):
+        chars = lookup[code]
+        result[code] = chars
+        if len(code) > SIJIAO_PREFIX:
+            prefix = code[:SIJIAO_PREFIX]
+            result[prefix] = result.get(prefix, "") + chars
+    return result
+
+
+def index_lookup(lookup: Dict[str, str], rows: Dict[str, int]) -> KeyIndex:
+    """检索码 -> 行号列表；不在 rows 中的字丢弃，同一码内的重复字只保留一次。"""
+    index: KeyIndex = {}
+    for code, chars in lookup.items():
+        seen: Dict[int, None] = {}
+        for char in chars:
+            row = rows.get(char)
+            if row is not None:
+                seen.setdefault(row)
+        if seen:
+            index[code] = list(seen)
+    return index
+
+
+def build_index(records: Records, lookups: Dict[str, Dict[str, str]]) -> Dict[str, object]:
+    # 同名记录以最后一条为准，与 makeMapFromArray 一致
+    rows = {record["name"]: i for i, record in enumerate(records)}
+    data: Dict[str, object] = {"version": VERSION, "cards": records}
+    for kind, lookup in lookups.items():
+        if kind == "sijiao":
+            lookup = merge_sijiao_prefix(lookup)
+        data[kind] = index_lookup(lookup, rows)
+    return data
+
+
+def intern_index(data: Dict[str, object]) -> Dict[str, object]:
+    """把 cards 换成字符串表加下标的扁平数组。"""
+    strings: List[str] = []
+    ids: Dict[str, int] = {}
+    flat: List[int] = []
+    for record in data["cards"]:  # type: ignore[union-attr]
+        for field in ("name", "comp", "key"):
+            value = record[field]
+            i = ids.get(value)
+            if i is None:
+                i = ids[value] = len(strings)
+                strings.append(value)
+            flat.append(i)
+    interned = {"version": VERSION, "strings": strings, "cards": flat}
+    interned.update((k, v) for k, v in data.items() if k not in interned)
+    return interned
+
+
+def write_json(path: str, data: object) -> int:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    return os.path.getsize(path)
+
+
+def build_search_index(scheme_dir: str, data_dir: str = DATA_DIR, interned: bool = False) -> Dict[str, int]:
+    """写出 search.json（interned 时另写 search.interned.json），返回 文件名 -> 字节数。"""
+    with phase("load"):
+        lookups = {kind: load_lookup(os.path.join(data_dir, f"{kind}.json")) for kind in KINDS}
+    # build_chaifen_records 内部另分 tokenize / load / map
+    records = build_chaifen_records(scheme_dir)
+    with phase("aggregate"):
+        data = build_index(records, lookups)
+    with phase("serialize"):
+        sizes = {OUT_INDEX: write_json(os.path.join(scheme_dir, OUT_INDEX), data)}
+        if interned:
+            sizes[OUT_INTERNED] = write_json(os.path.join(scheme_dir, OUT_INTERNED), intern_index(data))
+    return sizes
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="合并拼音、笔画、四角号码与拆分记录，生成搜索索引")
+    parser.add_argument("scheme_dir", nargs="?", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="pinyin.json 等检索数据所在目录")
+    parser.add_argument("--interned", action="store_true", help=f"另写字符串表布局的 {OUT_INTERNED}")
+    args = parser.parse_args(argv)
+    sizes = build_search_index(args.scheme_dir, args.data_dir, args.interned)
+    for name, size in sizes.items():
+        print(f"已生成 {os.path.join(args.scheme_dir, name)}（{size / 1024:.1f} KB）")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+比较同一张码表或拆分表的两个版本，按字对齐后报告差异。
+
+支持三种表（默认按内容自动识别，也可用 --kind 指定）：
+- code：ll_fullcode.txt，字\t编码\t字频，比较编码；
+- hao：hao_div.txt，字\t[拆分,拼音,CJK]\t权重，比较拆分；
+- div：ll_div.txt / ll_div.real.txt，字\t构形串，比较切分出的部件序列（divparse.split_components），
+  `八 儿` 与 `八儿` 这类只差空格的写法视为相同。
+
+两份文件各自按行排序（行首是字，字后紧跟制表符，整行比较即按字排序），然后像归并排序
+一样同时顺序走两边，按字对齐，不建立整表的字典。行数超过 --run-lines 时先分段排好序
+写入临时文件，再多路归并，内存只与分段大小有关。
+
+报告新增、删除的字，编码或拆分有变化的字，以及按字频加权的影响：受影响的字的字频
+占新表总字频的比例（删除的字按旧表字频计）。同一字有多行时，各行的编码或拆分作为一个集合比较。
+
+用法：
+  python src/tools/tablediff.py 旧文件 新文件 [--kind code|hao|div] [--limit 20]
+  python src/tools/tablediff.py --rev HEAD src/public/liuli/ll_fullcode.txt
+  后一种写法比较 git 中某个版本与工作区中的同一文件。
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from itertools import islice
+from typing import IO, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from divparse import split_components
+from generate_zigen_hao import extract_components
+
+KINDS = ("code", "hao", "div")
+DEFAULT_RUN_LINES = 500_000
+
+
+# 编码或拆分：code、hao 为字符串，div 为部件元组
+Value = Union[str, Tuple[str, ...]]
+
+
+class Entry(NamedTuple):
+    char: str
+    values: Tuple[Value, ...]  # 该字各行的编码或拆分，已排序
+    weight: float
+
+
+class Change(NamedTuple):
+    char: str
+    old: Tuple[Value, ...]
+    new: Tuple[Value, ...]
+    weight: float
+
+
+class DiffReport(NamedTuple):
+    kind: str
+    old_count: int
+    new_count: int
+    added: List[Entry]
+    removed: List[Entry]
+    changed: List[Change]
+    reweighted: int  # 只有字频变化的字数
+    old_weight: float
+    new_weight: float
+
+    def impact(self, entries: List) -> float:
+        return sum(e.weight for e in entries) / self.new_weight if self.new_weight else 0.0
+
+
+def _float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return 0.0
+
+
+def parse_code(fields: List[str]) -> Tuple[Value, float]:
+    return fields[1], _float(fields[2]) if len(fields) > 2 else 0.0
+
+
+def parse_hao(fields: List[str]) -> Tuple[Value, float]:
+    return "".join(extract_components("\t".join(fields))), _float(fields[-1].strip()) if len(fields) > 2 else 0.0
+
+
+def parse_div(fields: List[str]) -> Tuple[Value, float]:
+    return tuple(split_components(fields[1])), 0.0
+
+
+PARSERS: Dict[str, Callable[[List[str]], Tuple[Value, float]]] = {
+    "code": parse_code,
+    "hao": parse_hao,
+    "div": parse_div,
+}
+
+
+def detect_kind(path: str) -> str:
+    """按第一条有效行的格式判断表的种类。"""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 2 or not fields[0]:
+                continue
+            if fields[1].startswith("["):
+                return "hao"
+            if len(fields) >= 3 and fields[2].strip().replace(".", "", 1).isdigit():
+                return "code"
+            return "div"
+    return "div"
+
+
+def _spill(lines: List[str]) -> IO[str]:
+    run = tempfile.TemporaryFile("w+", encoding="utf-8")
+    run.writelines(line + "\n" for line in lines)
+    run.seek(0)
+    return run
+
+
+def sorted_lines(path: str, stack: ExitStack, run_lines: int = DEFAULT_RUN_LINES) -> Iterator[str]:
+    """按行排序后的非空行。行数不超过 run_lines 时在内存中排序，否则分段排序后归并。"""
+    runs: List[IO[str]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        while True:
+            raw = list(islice(f, run_lines))
+            at_end = len(raw) < run_lines
+            chunk = [line.rstrip("\n") for line in raw if line.strip()]
+            chunk.sort()
+            if at_end and not runs:
+                return iter(chunk)
+            if chunk:
+                runs.append(stack.enter_context(_spill(chunk)))
+            if at_end:
+                break
+    return heapq.merge(*((line.rstrip("\n") for line in run) for run in runs))
+
+
+def iter_entries(lines: Iterator[str], kind: str) -> Iterator[Entry]:
+    """把已排序的行按字分组。绝大多数字只有一行，这里不用 groupby，逐行比较字即可。"""
+    parse = PARSERS[kind]
+    char: Optional[str] = None
+    values: List[Value] = []
+    weight = 0.0
+    for line in lines:
+        fields = line.split("\t")
+        if len(fields) < 2 or not fields[0]:
+            continue
+        value, w = parse(fields)
+        if fields[0] == char:
+            values.append(value)
+            weight = max(weight, w)
+            continue
+        if char is not None:
+            yield Entry(char, tuple(sorted(values)), weight)
+        char, values, weight = fields[0], [value], w
+    if char is not None:
+        yield Entry(char, tuple(sorted(values)), weight)
+
+
+def diff_entries(old: Iterator[Entry], new: Iterator[Entry], kind: str) -> DiffReport:
+    added: List[Entry] = []
+    removed: List[Entry] = []
+    changed: List[Change] = []
+    counts = [0, 0]
+    weights = [0.0, 0.0]
+    reweighted = 0
+    a = next(old, None)
+    b = next(new, None)
+    while a is not None and b is not None:
+        if a.char == b.char:
+            if a.values != b.values:
+                changed.append(Change(a.char, a.values, b.values, b.weight))
+            elif a.weight != b.weight:
+                reweighted += 1
+            counts[0] += 1
+            counts[1] += 1
+            weights[0] += a.weight
+            weights[1] += b.weight
+            a = next(old, None)
+            b = next(new, None)
+        elif a.char < b.char:
+            removed.append(a)
+            counts[0] += 1
+            weights[0] += a.weight
+            a = next(old, None)
+        else:
+            added.append(b)
+            counts[1] += 1
+            weights[1] += b.weight
+            b = next(new, None)
+    # 一边走完后，另一边剩下的都是新增或删除
+    for rest, bucket, side in ((old, removed, 0), (new, added, 1)):
+        entry = a if side == 0 else b
+        while entry is not None:
+            bucket.append(entry)
+            counts[side] += 1
+            weights[side] += entry.weight
+            entry = next(rest, None)
+    return DiffReport(kind, counts[0], counts[1], added, removed, changed, reweighted, weights[0], weights[1])
+
+
+def diff_tables(old_path: str, new_path: str, kind: Optional[str] = None, run_lines: int = DEFAULT_RUN_LINES) -> DiffReport:
+    kind = kind or detect_kind(new_path)
+    with ExitStack() as stack:
+        old = iter_entries(sorted_lines(old_path, stack, run_lines), kind)
+        new = iter_entries(sorted_lines(new_path, stack, run_lines), kind)
+        return diff_entries(old, new, kind)
+
+
+def format_report(report: DiffReport, limit: int = 20) -> List[str]:
+    what = "编码" if report.kind == "code" else "拆分"
+    lines = [
+        f"旧表 {report.old_count} 字，新表 {report.new_count} 字",
+        f"新增 {len(report.added)} 字，删除 {len(report.removed)} 字，{what}变化 {len(report.changed)} 字，"
+        f"仅字频变化 {report.reweighted} 字",
+    ]
+    if report.new_weight:
+        added, removed, changed = (report.impact(x) for x in (report.added, report.removed, report.changed))
+        lines.append(f"按字频加权的影响 {added + removed + changed:.4%}"
+                     f"（新增 {added:.4%}，删除 {removed:.4%}，{what}变化 {changed:.4%}）")
+
+    def show(values: Tuple[Value, ...]) -> str:
+        # div 表的部件以空格分隔，同一字有多行拆分时各行以 | 分隔
+        sep = " | " if values and isinstance(values[0], tuple) else " "
+        return sep.join(v if isinstance(v, str) else " ".join(v) for v in values)
+
+    def fmt(weight: float) -> str:
+        return str(int(weight)) if weight.is_integer() else f"{weight:.10f}"
+
+    def top(items: List) -> List:
+        # 按字频从高到低列出
+        return sorted(items, key=lambda e: -e.weight)[:limit]
+
+    if report.changed:
+        lines.append(f"{what}变化：")
+        lines += [f"  {c.char}\t{show(c.old)} -> {show(c.new)}\t{fmt(c.weight)}" for c in top(report.changed)]
+    for title, entries in (("新增", report.added), ("删除", report.removed)):
+        if entries:
+            lines.append(f"{title}：")
+            lines += [f"  {e.char}\t{show(e.values)}\t{fmt(e.weight)}" for e in top(entries)]
+    return lines
+
+
+def git_show(rev: str, path: str, dest: IO[bytes]) -> None:
+    """把 git 中 rev 版本的 path 写入 dest。"""
+    directory, name = os.path.split(os.path.abspath(path))
+    subprocess.run(["git", "show", f"{rev}:./{name}"], cwd=directory, stdout=dest, check=True)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="按字比较码表或拆分表的两个版本")
+    parser.add_argument("files", nargs="+", help="旧文件 新文件；用 --rev 时只给一个文件")
+    parser.add_argument("--rev", help="与 git 中该版本的同一文件比较")
+    parser.add_argument("--kind", choices=KINDS, help="表的种类，默认自动识别")
+    parser.add_argument("--limit", type=int, default=20, help="每类最多列出的字数")
+    parser.add_argument("--run-lines", type=int, default=DEFAULT_RUN_LINES, help="内存中排序的最大行数")
+    args = parser.parse_args(argv)
+    if len(args.files) != (1 if args.rev else 2):
+        parser.error("需要 旧文件 新文件，或 --rev 版本 文件")
+
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        if args.rev:
+            new_path = args.files[0]
+            old_file = stack.enter_context(tempfile.NamedTemporaryFile(suffix=".txt", delete=False))
+            stack.callback(os.remove, old_file.name)
+            git_show(args.rev, new_path, old_file)
+            old_file.close()
+            old_path = old_file.name
+        else:
+            old_path, new_path = args.files
+        report = diff_tables(old_path, new_path, args.kind, args.run_lines)
+    print("\n".join(format_report(report, args.limit)))
+    print(f"用时 {time.perf_counter() - start:.2f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
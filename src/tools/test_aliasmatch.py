@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+from aliasmatch import AliasMatcher
+
+
+def brute_force(mapping, text):
+    """逐个位置试最长的别名，作为对照。"""
+    aliases = sorted((a for a in mapping if a), key=len, reverse=True)
+    matches = []
+    i = 0
+    while i < len(text):
+        alias = next((a for a in aliases if text.startswith(a, i)), None)
+        if alias:
+            matches.append((i, i + len(alias), alias))
+            i += len(alias)
+        else:
+            i += 1
+    return matches
+
+
+def test_leftmost_longest():
+    matcher = AliasMatcher({"在字框": "A", "字框": "B", "框": "C", "斜玉": "D", "": "E"})
+    assert len(matcher) == 5
+    assert matcher.find("白在字框丶") == [(1, 4, "在字框")]
+    # 起点靠左的优先，即使右边能匹配更长的别名
+    assert matcher.find("字框在字框") == [(0, 2, "字框"), (2, 5, "在字框")]
+    assert matcher.replace("白在字框丶斜玉框") == "白A丶DC"
+    assert matcher.replace("没有别名") == "没有别名"
+
+
+def test_overlapping_aliases_via_fail_links():
+    # abcd 失配后要经失配链接落到 bc 上
+    matcher = AliasMatcher({"abcd": "1", "bc": "2", "c": "3", "bcx": "4"})
+    assert matcher.find("abcx") == [(1, 4, "bcx")]
+    assert matcher.find("abcc") == [(1, 3, "bc"), (3, 4, "c")]
+    assert matcher.replace("abcdbcx") == "14"
+
+
+def test_matches_brute_force_on_random_text():
+    rng = random.Random(0)
+    alphabet = "abc"
+    for _ in range(200):
+        mapping = {"".join(rng.choices(alphabet, k=rng.randint(1, 4))): "X" for _ in range(rng.randint(1, 6))}
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+        assert AliasMatcher(mapping).find(text) == brute_force(mapping, text)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from chaifenbin import decode_chaifen_bin, encode_chaifen_bin
+
+
+def test_round_trip():
+    records = [
+        {"name": "樲", "comp": "木禾丂{戈无一}", "key": "mhkg"},
+        {"name": "⺀", "comp": "", "key": ""},
+        # 增补平面的字在 JS 中占两个码元，长度表按码元计
+        {"name": "𠂇", "comp": "𠂇丨", "key": "ab"},
+    ]
+    data = encode_chaifen_bin(records)
+    assert data[:4] == b"CFB1"
+    assert decode_chaifen_bin(data) == records
+    assert decode_chaifen_bin(encode_chaifen_bin([])) == []
+
+
+def test_errors():
+    # 长度以一个字节存放，超长时指出是哪个字
+    encode_chaifen_bin([{"name": "字", "comp": "口" * 255, "key": ""}])
+    with pytest.raises(ValueError, match="^字 的 comp"):
+        encode_chaifen_bin([{"name": "字", "comp": "口" * 255 + "𠂇", "key": ""}])
+    with pytest.raises(ValueError):
+        decode_chaifen_bin(b"[{}]")
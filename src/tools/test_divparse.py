@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from divparse import merge_braced, parse_zigen_sequence, split_components, tokenize_div_rhs
+
+
+@pytest.mark.parametrize(
+    "rhs, expected",
+    [
+        ("", []),
+        ("木禾", [("木", False), ("禾", False)]),
+        ("土{成三}{戈无一}", [("土", False), ("成三", True), ("戈无一", True)]),
+        ("{}", [("", True)]),
+        # 没有闭合的 `{` 按单字处理
+        ("a{b", [("a", False), ("{", False), ("b", False)]),
+        # `{` 到第一个 `}` 为止，中间的 `{` 属于花括号内容
+        ("{a{b}c", [("a{b", True), ("c", False)]),
+        ("a}b{c", [("a", False), ("}", False), ("b", False), ("{", False), ("c", False)]),
+        ("{{x}}", [("{x", True), ("}", False)]),
+    ],
+)
+def test_tokenize_div_rhs(rhs, expected):
+    assert tokenize_div_rhs(rhs) == expected
+    # parse_zigen_sequence 与 tokenize_div_rhs 的切分规则一致
+    assert parse_zigen_sequence(rhs) == [t for t, _ in expected]
+
+
+def test_split_components():
+    assert split_components("白{在字框}丶") == ["白", "在字框", "丶"]
+    # 旧的空格分隔格式按空格切分，首尾空白忽略
+    assert split_components(" 八  儿 ") == ["八", "儿"]
+    assert split_components("木禾\n") == ["木", "禾"]
+
+
+def test_merge_braced():
+    assert merge_braced(["白", "{", "在", "字", "框", "}", "丶"]) == ("白", "{在字框}", "丶")
+    # 连续写法已整体切出，原样返回
+    assert merge_braced(["白", "在字框", "丶"]) == ("白", "在字框", "丶")
+    # 没有闭合时保留原样
+    assert merge_braced(["{", "在", "字"]) == ("{", "在", "字")
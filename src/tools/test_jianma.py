@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from evaluate import CodeEntry
+from jianma import allocate, parse_slots, weighted_length
+
+
+def test_parse_slots():
+    assert parse_slots("1=1, 2=2,3=0,") == {1: 1, 2: 2, 3: 0}
+    for text in ("1", "0=1", "1=-1"):
+        with pytest.raises(ValueError):
+            parse_slots(text)
+
+
+def test_allocate_by_frequency():
+    entries = [
+        CodeEntry("的", "abcd", 100.0),
+        CodeEntry("一", "abcef", 50.0),
+        CodeEntry("是", "bcde", 10.0),
+        CodeEntry("不", "ab", 5.0),  # 全码本身占着二简 ab 的首位
+        CodeEntry("零", "cdef", 0.0),  # 字频为 0 的字不分配
+    ]
+    short = allocate(entries, {1: 1, 2: 3})
+    # “的”占一简 a 节省 300，“一”在 ab 排第二位节省 100，合计 400；
+    # 换成“一”占 a（200）、“的”在 ab 第二位（100）只有 300
+    assert [(s.char, s.code, s.rank, s.saving) for s in short] == [
+        ("的", "a", 0, 300.0),
+        ("一", "ab", 1, 100.0),  # 排在全码“不”之后，多按一次选重键
+        ("是", "b", 0, 30.0),
+    ]
+    before, after = weighted_length(entries, short)
+    assert before == pytest.approx(700 / 165)
+    assert after == pytest.approx((700 - 430) / 165)
+
+
+def test_allocate_moves_weaker_char_to_free_slot():
+    # 贪心时“的”占了一简 a（节省 120），“了”的二简 ax 已被全码“乙”占满，分不到简码；
+    # 把“的”挪到空着的二简 ab（80），“了”放上 a（105），合计多于 120
+    entries = [CodeEntry("的", "abcd", 40.0), CodeEntry("了", "axyz", 35.0), CodeEntry("乙", "ax", 1.0)]
+    slots = {1: 1, 2: 1}
+    assert {s.char: s.code for s in allocate(entries, slots, relocate=False)} == {"的": "a"}
+    assert {s.char: s.code for s in allocate(entries, slots)} == {"了": "a", "的": "ab"}
+
+
+def test_allocate_relocation_keeps_free_slot_for_own_candidate():
+    # “了”换下“的”只多省 65，不如让“了”直接取空着的 ab（70），不腾挪
+    entries = [CodeEntry("一", "acde", 30.0), CodeEntry("的", "abcd", 40.0), CodeEntry("了", "abxx", 35.0)]
+    short = allocate(entries, {1: 1, 2: 1})
+    assert {s.char: s.code for s in short} == {"的": "a", "了": "ab", "一": "ac"}
+
+
+def test_relocation_never_lowers_saving():
+    for seed in range(200):
+        rng = random.Random(seed)
+        entries = [
+            CodeEntry(chr(0x4E00 + k), "".join(rng.choice("abc") for _ in range(rng.randint(1, 4))),
+                      float(rng.randint(0, 50)))
+            for k in range(rng.randint(2, 12))
+        ]
+        slots = {1: rng.randint(0, 2), 2: rng.randint(0, 2), 3: rng.randint(0, 1)}
+        greedy = sum(s.saving for s in allocate(entries, slots, relocate=False))
+        assert sum(s.saving for s in allocate(entries, slots)) >= greedy, seed
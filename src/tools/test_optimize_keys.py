@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import random
+
+import pytest
+
+from evaluate import KEYS, N_KEYS
+from optimize_keys import State, anneal, build_problem
+
+
+def random_problem(seed, pair_table=True):
+    rng = random.Random(seed)
+    keys = KEYS[:6]
+    # 字根编码两码，部分字根同码（已归并）
+    root_map = {}
+    for i in range(12):
+        code = rng.choice(keys) + rng.choice(keys)
+        root_map[f"r{i}"] = {"key": code[0], "secondary": code[1]}
+    roots = list(root_map)
+    chars = [
+        (f"c{i}", tuple(rng.choices(roots, k=rng.randint(1, 4))), float(rng.randint(1, 100)))
+        for i in range(200)
+    ]
+    table = [rng.uniform(1.0, 2.0) for _ in range(N_KEYS * N_KEYS)] if pair_table else None
+    return build_problem(root_map, chars, top=150, pair_table=table)
+
+
+def root_codes(problem, assign):
+    return [KEYS[k] + code[1:] for code, k in zip(problem.groups, assign)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_move_delta_equals_full_rescore(seed):
+    problem = random_problem(seed)
+    rng = random.Random(seed)
+    state = State(problem, problem.initial)
+    cost = state.cost()
+    moves = 0
+    for _ in range(300):
+        group = rng.randrange(len(problem.groups))
+        key = rng.choice(problem.keys)
+        if not state.is_free(group, key):
+            continue
+        cost += state.move(group, key)
+        moves += 1
+        full = State(problem, state.assign)
+        assert cost == pytest.approx(full.cost(), abs=1e-9)
+        assert state.codes == full.codes
+        assert state.dup_freq == pytest.approx(full.dup_freq, abs=1e-9)
+        assert state.equiv_sum == pytest.approx(full.equiv_sum, abs=1e-9)
+        assert state.changed == full.changed
+    assert moves > 50
+
+
+def test_move_to_occupied_code_is_rejected():
+    problem = random_problem(0)
+    state = State(problem, problem.initial)
+    # 找一组，把它移到与另一组相同的字根编码上
+    for g, code in enumerate(problem.groups):
+        other = next((h for h, c in enumerate(problem.groups) if h != g and c[1:] == code[1:]), None)
+        if other is not None:
+            break
+    key = state.assign[other]
+    assert not state.is_free(g, key)
+    with pytest.raises(ValueError):
+        state.move(g, key)
+
+
+@pytest.mark.parametrize("pair_table", [True, False])
+def test_anneal_keeps_root_codes_unique(pair_table):
+    problem = random_problem(7, pair_table)
+    initial = State(problem, problem.initial).cost()
+    outcome = anneal(problem, seed=1, steps=3000, t_start=0.5)
+    codes = root_codes(problem, outcome.assign)
+    assert len(set(codes)) == len(codes)
+    assert outcome.cost == pytest.approx(State(problem, outcome.assign).cost(), abs=1e-9)
+    assert outcome.cost <= initial + 1e-9
+    # 留下的每一处改动都有用：单独移回原大码都会使代价升高
+    for g, k in enumerate(outcome.assign):
+        if k != problem.initial[g]:
+            state = State(problem, outcome.assign)
+            if state.is_free(g, problem.initial[g]):
+                assert state.move(g, problem.initial[g]) > 0
+
+
+def test_anneal_max_changes():
+    problem = random_problem(3)
+    outcome = anneal(problem, seed=2, steps=3000, t_start=0.005, max_changes=2)
+    assert sum(k != i for k, i in zip(outcome.assign, problem.initial)) <= 2
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+from rime import export_scheme, iter_div_entries, iter_hao_div_entries
+
+
+def test_div_keeps_braced_roots():
+    # 多字的字根名保留花括号，与 chaifen.json 的 comp 相同
+    lines = ["樲\t木禾丂{戈无一}", "", "旧 [温字框 目]"]
+    assert list(iter_div_entries(lines)) == ["樲\t木禾丂{戈无一}", "旧\t{温字框}目"]
+
+
+def test_hao_integer_and_fractional_weights():
+    lines = [
+        "的\t[白勹丶,de_dī_dí_dì,CJK]\t10359470",
+        "更\t[{凬字心},gèng_gēng,CJK]\t0.0099999807 ",
+    ]
+    assert list(iter_hao_div_entries(lines)) == [
+        "的\t白勹丶\t10359470",
+        "更\t{凬字心}\t0.0099999807",
+    ]
+
+
+def test_export_writes_schema_and_patch_for_chaifen(tmp_path):
+    (tmp_path / "ll_div.real.txt").write_text("樲\t木禾丂{戈无一}\n", encoding="utf-8")
+    written = export_scheme(str(tmp_path), "liuli", str(tmp_path / "out"))
+    assert [os.path.basename(p) for p in written] == [
+        "liuli_chaifen.dict.yaml",
+        "liuli_chaifen.schema.yaml",
+        "liuli_chaifen.patch.yaml",
+    ]
+    schema = (tmp_path / "out" / "liuli_chaifen.schema.yaml").read_text(encoding="utf-8")
+    assert "  schema_id: liuli_chaifen\n" in schema
+    assert "  dictionary: liuli_chaifen\n" in schema
+    patch = (tmp_path / "out" / "liuli_chaifen.patch.yaml").read_text(encoding="utf-8")
+    assert "    - liuli_chaifen\n" in patch  # schema/dependencies
+    assert "    - reverse_lookup_filter@chaifen_lookup\n" in patch
+    assert "    dictionary: liuli_chaifen\n" in patch
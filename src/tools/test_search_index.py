@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+
+from search_index import build_index, intern_index, js_key_order, merge_sijiao_prefix
+
+TESTDATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testdata")
+
+
+def test_merge_sijiao_prefix_matches_prehandle_json():
+    # input 取自 src/public/data/sijiao.json 中的几个前 4 码，expected 是在 node 中
+    # 对 input 运行 components/search/share.ts 的 prehandleJson 得到的结果
+    with open(os.path.join(TESTDATA, "sijiao_prehandle.json"), "r", encoding="utf-8") as f:
+        fixture = json.load(f)
+    assert merge_sijiao_prefix(fixture["input"]) == fixture["expected"]
+
+
+def test_js_key_order():
+    keys = {"00227": "", "10": "", "0": "", "0022": "", "2": "", "4294967295": "", "x": ""}
+    assert js_key_order(keys) == ["0", "2", "10", "00227", "0022", "4294967295", "x"]
+
+
+def test_build_and_intern_index():
+    records = [{"name": "口", "comp": "口", "key": "k"}, {"name": "回", "comp": "口口", "key": "kk"}]
+    lookups = {"pinyin": {"kou": "口叩", "hui": "回回"}, "bihua": {}, "sijiao": {"60000": "口", "6060": "回"}}
+    data = build_index(records, lookups)
+    assert data["pinyin"] == {"kou": [0], "hui": [1]}
+    assert data["sijiao"] == {"60000": [0], "6000": [0], "6060": [1]}
+    interned = intern_index(data)
+    assert interned["strings"] == ["口", "k", "回", "口口", "kk"]
+    assert interned["cards"] == [0, 0, 1, 2, 3, 4]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+from tablediff import diff_tables, format_report
+
+
+def write(path, lines):
+    path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+    return str(path)
+
+
+def test_div_whitespace_only_difference_is_empty(tmp_path):
+    old = write(tmp_path / "old.txt", ["儿\t八 儿", "土\t土 ", "一\t一"])
+    new = write(tmp_path / "new.txt", ["一\t一", "儿\t八儿", "土\t土"])
+    report = diff_tables(old, new, "div")
+    assert (report.added, report.removed, report.changed) == ([], [], [])
+    assert report.old_count == report.new_count == 3
+
+
+def test_div_component_change_is_reported(tmp_path):
+    old = write(tmp_path / "old.txt", ["儿\t八 儿"])
+    new = write(tmp_path / "new.txt", ["儿\t八几"])
+    [change] = diff_tables(old, new, "div").changed
+    assert change.old == (("八", "儿"),)
+    assert change.new == (("八", "几"),)
+
+
+def test_code_added_removed_changed_and_impact(tmp_path):
+    old = write(tmp_path / "old.txt", ["的\tzz\t60", "一\tyy\t30", "乙\tqq\t10"])
+    new = write(tmp_path / "new.txt", ["的\tzx\t60", "一\tyy\t30", "丁\tdd\t10"])
+    report = diff_tables(old, new)
+    assert report.kind == "code"
+    assert [c.char for c in report.changed] == ["的"]
+    assert [e.char for e in report.added] == ["丁"]
+    assert [e.char for e in report.removed] == ["乙"]
+    assert report.impact(report.changed) == 0.6
+    assert "  的\tzz -> zx\t60" in format_report(report)
+
+
+def test_external_sort_matches_in_memory(tmp_path):
+    chars = [chr(0x4E00 + i) for i in range(50)]
+    old = write(tmp_path / "old.txt", [f"{c}\t{c}{i % 7}\t{i}" for i, c in enumerate(reversed(chars))])
+    new = write(tmp_path / "new.txt", [f"{c}\t{c}{i % 5}\t{i}" for i, c in enumerate(chars[5:])])
+    # run_lines 小于行数时分段排序后归并
+    spilled = diff_tables(old, new, "code", run_lines=8)
+    in_memory = diff_tables(old, new, "code")
+    assert spilled == in_memory
+    assert len(spilled.removed) == 5
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+监视各方案的源文件，有改动时只重新生成受影响的输出。
+
+启动时先增量构建一遍并预先载入拆分表，之后每隔 --interval 秒检查一次各方案源文件
+（build.py 中要运行的步骤的输入里不由其他步骤生成的那些，如 ll_map.real.txt、ll_fullcode.txt）
+的修改时间与大小。可选步骤与 build.py 一样要用 --with 指明，此时监视的是它们的输入，
+如 --with convert_map 时监视 ll_map.txt、PUAtoalias.txt。
+有变化时对涉及的方案调用 build.build_scheme：各步骤照常按内容哈希判断是否需要重跑，
+例如只改了 ll_map.real.txt 时只会重跑 zigen 与 fullcode_check。
+
+进程常驻，已解析的表留在内存中：拆分表的切分结果（divparse.load_div）与例字统计
+（generate_zigen.load_root_index）按文件状态缓存，对应文件没变就不再重新计算，
+只改字根表时一轮通常在几百毫秒内完成。没有输出、只做检查的步骤（fullcode_check）
+默认不运行，加 --checks 时运行。
+
+只用轮询，不依赖第三方的文件系统通知库。按 Ctrl-C 退出。
+
+用法：
+  python src/tools/watch.py [方案 ...] [--interval 0.3] [--checks] [--verbose] [--with 步骤]
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import build
+from generate_zigen import load_root_index
+
+DEFAULT_INTERVAL = 0.3
+# 发现改动后再等一会儿，编辑器可能分几次写完一个文件
+SETTLE_SECONDS = 0.05
+
+FileState = Optional[Tuple[int, int]]
+
+
+def source_files(scheme: str, extra: Sequence[str] = ()) -> List[str]:
+    """方案中要运行的步骤的输入里，不由这些步骤生成的文件。"""
+    stages = build.active_stages(scheme, extra)
+    produced = {out for stage in stages for out in stage.outputs}
+    scheme_dir = os.path.join(build.PUBLIC_DIR, scheme)
+    names = dict.fromkeys(name for stage in stages for name in stage.inputs if name not in produced)
+    return [os.path.normpath(os.path.join(scheme_dir, name)) for name in names]
+
+
+def file_state(path: str) -> FileState:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def snapshot(paths: Sequence[str]) -> Dict[str, FileState]:
+    return {path: file_state(path) for path in paths}
+
+
+def warm_caches(scheme: str) -> None:
+    """预先解析拆分表并统计例字，第一次改动字根表时也不必从头计算。"""
+    scheme_dir = os.path.join(build.PUBLIC_DIR, scheme)
+    div = os.path.join(scheme_dir, "ll_div.real.txt")
+    if os.path.exists(div):
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_root_index(div, os.path.join(scheme_dir, "ll_fullcode.txt"))
+
+
+def rebuild(scheme: str, checks: bool, verbose: bool, extra: Sequence[str] = ()) -> None:
+    """构建一个方案并打印一行摘要；出错时打印 traceback 后继续监视。"""
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(sys.stdout if verbose else log):
+            executed = build.build_scheme(scheme, checks=checks, extra=extra)
+    except Exception:
+        sys.stdout.write(log.getvalue())
+        traceback.print_exc()
+        print(f"[{scheme}] 构建失败，继续监视", flush=True)
+        return
+    ms = (time.perf_counter() - start) * 1000
+    done = "、".join(executed) if executed else "无需更新"
+    print(f"[{scheme}] {done}（{ms:.0f} ms）", flush=True)
+
+
+def watch(
+    schemes: Sequence[str],
+    interval: float = DEFAULT_INTERVAL,
+    checks: bool = False,
+    verbose: bool = False,
+    extra: Sequence[str] = (),
+) -> None:
+    files = {scheme: source_files(scheme, extra) for scheme in schemes}
+    watched = sorted({path for paths in files.values() for path in paths})
+
+    for scheme in schemes:
+        rebuild(scheme, checks, verbose, extra)
+        warm_caches(scheme)
+    print(f"正在监视 {len(watched)} 个文件，按 Ctrl-C 退出", flush=True)
+
+    last = snapshot(watched)
+    while True:
+        time.sleep(interval)
+        current = snapshot(watched)
+        if current == last:
+            continue
+        time.sleep(SETTLE_SECONDS)
+        current = snapshot(watched)
+        changed = {path for path in watched if current[path] != last[path]}
+        last = current
+        for path in sorted(changed):
+            print(f"改动：{os.path.relpath(path, build.REPO_ROOT)}", flush=True)
+        for scheme in schemes:
+            if changed.intersection(files[scheme]):
+                rebuild(scheme, checks, verbose, extra)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="监视方案源文件并增量重新生成")
+    parser.add_argument("schemes", nargs="*", metavar="scheme",
+                        help=f"要监视的方案，默认全部：{', '.join(build.SCHEMES)}")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="检查间隔（秒）")
+    parser.add_argument("--checks", action="store_true", help="同时运行只做检查的步骤")
+    parser.add_argument("--verbose", "-v", action="store_true", help="显示各生成脚本的输出")
+    parser.add_argument("--with", dest="extra", action="append", default=[], metavar="步骤",
+                        help="同时运行该可选步骤，见 build.py --list")
+    args = parser.parse_args(argv)
+    unknown = [s for s in args.schemes if s not in build.SCHEMES]
+    if unknown:
+        parser.error(f"未知方案：{', '.join(unknown)}")
+    try:
+        watch(args.schemes or list(build.SCHEMES), args.interval, args.checks, args.verbose, args.extra)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
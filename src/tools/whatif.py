@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+“把某个字根改到另一个键上会怎样”的即时查询。
+
+讨论是否移动 ll_map.txt 中的某个字根时，原来要重新运行 root_convert.py 与各个生成脚本。
+这里只在启动时解析一次字根表与拆分表，建好“字根 -> 用到它的字”的倒排表和同码桶，
+之后每次查询只重算受影响的字，不改动任何文件，常用字根的一次查询在毫秒级。
+
+只统计字频前 N 的字（默认 6000，与 evaluate.py 的选重统计一致），同码字按字频排序，
+首选之外的字记为选重。返回的指标变化：
+- 新增选重 / 解除选重的字，以及选重数与动重（‱）的变化；
+- 加权键长的变化：按字频加权的平均码长，选重字另计一次选择键。
+
+用法：
+  python src/tools/whatif.py 字根=编码 [字根=编码 ...] [--scheme 方案目录] [--top 6000] [--chain]
+
+  编码只写一个字母时只换大码、保留小码；字根可写 PUAtoalias.txt 中的别名。
+  --chain 表示依次应用前面的移动，再评估后面的移动。
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from encode import encode_roots
+from evaluate import DEFAULT_TOP
+from generate_zigen import DEFAULT_SCHEME_DIR
+from optimize_keys import load_scheme
+from root_convert import NAME_PUA, load_pua_to_alias
+
+
+class MoveDelta(NamedTuple):
+    root: str
+    old_code: str
+    new_code: str
+    affected: int  # 编码有变化的字数
+    new_dups: List[str]  # 因移动而成为选重的字
+    resolved: List[str]  # 因移动而不再是选重的字
+    dup_delta: int
+    dup_rate_delta: float  # ‱
+    code_length_delta: float
+
+
+class RootMoveIndex:
+    """字根到字的倒排表与同码桶；按字频从高到低编号，编号小者为同码首选。"""
+
+    def __init__(self, scheme_dir: str = DEFAULT_SCHEME_DIR, top: int = DEFAULT_TOP) -> None:
+        _map_name, root_map, chars = load_scheme(scheme_dir)
+        self.root_codes: Dict[str, str] = {
+            root: entry["key"] + (entry["secondary"] or "") for root, entry in root_map.items()
+        }
+        self.aliases: Dict[str, str] = {}
+        if os.path.exists(os.path.join(scheme_dir, NAME_PUA)):
+            self.aliases = load_pua_to_alias(scheme_dir)
+
+        usable = [c for c in chars if c[1] and all(comp in self.root_codes for comp in c[1])]
+        usable.sort(key=lambda c: -c[2])
+
+        self.chars: List[str] = []
+        self.components: List[Tuple[str, ...]] = []
+        self.freqs: List[float] = []
+        self.codes: List[str] = []
+        for char, comps, freq in usable[:top]:
+            code = encode_roots([self.root_codes[comp] for comp in comps])
+            if code is None:
+                continue
+            self.chars.append(char)
+            self.components.append(tuple(comps))
+            self.freqs.append(freq)
+            self.codes.append(code)
+        self.total_freq = sum(self.freqs)
+
+        self.users: Dict[str, List[int]] = {}
+        self.buckets: Dict[str, List[int]] = {}
+        for i, comps in enumerate(self.components):
+            for comp in dict.fromkeys(comps):
+                self.users.setdefault(comp, []).append(i)
+            self.buckets.setdefault(self.codes[i], []).append(i)
+
+    def resolve(self, root: str) -> str:
+        """字根本身或其别名 -> 字根表中的字根。"""
+        if root in self.root_codes:
+            return root
+        real = self.aliases.get(root)
+        if real is not None and real in self.root_codes:
+            return real
+        raise KeyError(f"字根表中没有 {root}")
+
+    def _new_code(self, root: str, target: str) -> str:
+        old = self.root_codes[root]
+        new = (target + old[1:] if len(target) == 1 else target).lower()
+        if len(new) != len(old):
+            raise ValueError(f"编码 {target} 与字根编码 {old} 的长度不同")
+        return new
+
+    def _recode(self, root: str, new_code: str) -> Dict[int, str]:
+        """受影响的字 -> 新全码（只含编码有变化的字）。"""
+        codes = self.root_codes
+        changed: Dict[int, str] = {}
+        for i in self.users.get(root, ()):
+            code = encode_roots([new_code if comp == root else codes[comp] for comp in self.components[i]])
+            if code is not None and code != self.codes[i]:
+                changed[i] = code
+        return changed
+
+    def _dups(self, changed: Dict[int, str]) -> Tuple[Set[int], Set[int]]:
+        """受影响的同码桶在移动前、后的选重字。"""
+        arriving: Dict[str, List[int]] = {}
+        for i, code in changed.items():
+            arriving.setdefault(code, []).append(i)
+        touched = set(arriving)
+        touched.update(self.codes[i] for i in changed)
+
+        before: Set[int] = set()
+        after: Set[int] = set()
+        for code in touched:
+            old = self.buckets.get(code, [])
+            if len(old) > 1:
+                first = min(old)
+                before.update(i for i in old if i != first)
+            new = [i for i in old if i not in changed] + arriving.get(code, [])
+            if len(new) > 1:
+                first = min(new)
+                after.update(i for i in new if i != first)
+        return before, after
+
+    def what_if(self, root: str, target: str) -> MoveDelta:
+        """评估把 root 的编码改为 target（单个字母时只换大码），不改变当前状态。"""
+        root = self.resolve(root)
+        old_code = self.root_codes[root]
+        new_code = self._new_code(root, target)
+        changed = self._recode(root, new_code)
+        before, after = self._dups(changed)
+
+        freqs = self.freqs
+        new_dups = sorted(after - before)
+        resolved = sorted(before - after)
+        dup_freq = sum(freqs[i] for i in new_dups) - sum(freqs[i] for i in resolved)
+        length = sum(freqs[i] * (len(code) - len(self.codes[i])) for i, code in changed.items())
+        total = self.total_freq or 1.0
+        return MoveDelta(
+            root=root,
+            old_code=old_code,
+            new_code=new_code,
+            affected=len(changed),
+            new_dups=[self.chars[i] for i in new_dups],
+            resolved=[self.chars[i] for i in resolved],
+            dup_delta=len(after) - len(before),
+            dup_rate_delta=dup_freq / total * 10000,
+            code_length_delta=(length + dup_freq) / total,
+        )
+
+    def apply(self, root: str, target: str) -> MoveDelta:
+        """执行移动并更新倒排表之外的全部状态，返回与 what_if 相同的结果。"""
+        delta = self.what_if(root, target)
+        changed = self._recode(delta.root, delta.new_code)
+        for i, code in changed.items():
+            members = self.buckets[self.codes[i]]
+            members.remove(i)
+            if not members:
+                del self.buckets[self.codes[i]]
+            self.codes[i] = code
+            # 保持桶内按编号有序，首选仍是编号最小者
+            members = self.buckets.setdefault(code, [])
+            members.append(i)
+            members.sort()
+        self.root_codes[delta.root] = delta.new_code
+        return delta
+
+
+def format_delta(d: MoveDelta, limit: int = 20) -> str:
+    def chars(items: List[str]) -> str:
+        return "".join(items[:limit]) + ("…" if len(items) > limit else "")
+
+    return (
+        f"{d.root} {d.old_code} -> {d.new_code}：影响 {d.affected} 字，"
+        f"选重 {d.dup_delta:+d}，动重 {d.dup_rate_delta:+.2f}‱，加权键长 {d.code_length_delta:+.4f}\n"
+        f"  新增选重 {chars(d.new_dups) or '无'}\n"
+        f"  解除选重 {chars(d.resolved) or '无'}"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="移动单个字根的即时评估")
+    parser.add_argument("moves", nargs="+", help="字根=编码")
+    parser.add_argument("--scheme", default=DEFAULT_SCHEME_DIR, help="方案目录")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="只统计字频前 N 的字")
+    parser.add_argument("--chain", action="store_true", help="依次应用各项移动")
+    args = parser.parse_args(argv)
+
+    moves = []
+    for move in args.moves:
+        root, sep, code = move.rpartition("=")
+        if not sep or not root or not code:
+            parser.error(f"移动应写作 字根=编码：{move}")
+        moves.append((root, code))
+
+    start = time.perf_counter()
+    index = RootMoveIndex(args.scheme, args.top)
+    print(f"建立索引：{len(index.chars)} 字，{(time.perf_counter() - start) * 1000:.0f} ms")
+    for root, code in moves:
+        start = time.perf_counter()
+        try:
+            delta = index.apply(root, code) if args.chain else index.what_if(root, code)
+        except (KeyError, ValueError) as e:
+            # 未知字根（KeyError）或编码长度不对（ValueError）
+            parser.error(f"{root}={code}：{e.args[0] if e.args else e}")
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{format_delta(delta)}\n  耗时 {elapsed:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()